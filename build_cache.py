@@ -0,0 +1,55 @@
+"""Remembers which input file and rule version produced a cleaned file, so unchanged inputs are not cleaned again"""
+
+import hashlib      # sha256 of the input file
+import json     # the build record is a small json file next to the output
+import os       # file sizes and modification times
+
+
+def file_hash(path, block_size=1 << 20):
+    """Returns the sha256 of a file, read in blocks so big files do not have to fit in memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def record_path(output_path):
+    """Returns the path of the build record of an output file"""
+    return output_path + ".build.json"
+
+
+def file_stat(path):
+    """Returns the size and modification time of a file, they change whenever the file is written"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_fresh(input_path, output_path, rules_version):
+    """Returns True if the output was built from the same input content with the same rule version"""
+    try:
+        with open(record_path(output_path)) as record_file:
+            record = json.load(record_file)
+        if record["rules_version"] != rules_version or record["output_stat"] != file_stat(output_path):
+            return False        # other rules, or the output was changed or deleted after the build
+        if record["input_stat"] == file_stat(input_path):
+            return True     # same size and time, the input was not touched, no need to read it
+        # the input was touched, it is still fresh if the content is the same (for example a copy of the same export)
+        if record["input_hash"] != file_hash(input_path):
+            return False
+        record["input_stat"] = file_stat(input_path)        # so the next check does not read the file again
+        with open(record_path(output_path), "w") as record_file:
+            json.dump(record, record_file)
+        return True
+    except (OSError, ValueError, KeyError):     # no record yet, a broken record or a missing file
+        return False
+
+
+def record_build(input_path, output_path, rules_version):
+    """Saves the build record after the output has been written"""
+    record = {"input_hash": file_hash(input_path),
+              "input_stat": file_stat(input_path),
+              "output_stat": file_stat(output_path),
+              "rules_version": rules_version}
+    with open(record_path(output_path), "w") as record_file:
+        json.dump(record, record_file)
@@ -0,0 +1,56 @@
+"""Cleans many exports of the same survey in parallel, one process per input file, and merges the results"""
+
+import argparse     # command line options
+import os       # cpu_count for the default number of workers
+from concurrent.futures import ProcessPoolExecutor      # pool of worker processes, so every core is used
+
+import pandas as pd     # the partitions are read, cleaned and merged as DataFrames
+from cleaning import clean, print_report        # the same single-mask cleaning as the scripts use
+from data_prob_2 import DATAPROB2_RULES, DATAPROB2_DERIVED      # rules of DataProb2.csv
+from helmets_cleaning import HELMETS_RULES      # rules of the helmets dataset
+
+# dataset name -> (rules, derived columns, options for pd.read_csv)
+DATASETS = {"dataprob2": (DATAPROB2_RULES, DATAPROB2_DERIVED, {"delimiter": ";"}),
+            "helmets": (HELMETS_RULES, (), {"delimiter": ";"})}
+
+
+def clean_partition(dataset, input_path):
+    """Cleans one input file in a worker process, returns the clean DataFrame, the report and the number of rows read"""
+    rules, derived, read_options = DATASETS[dataset]
+    df = pd.read_csv(input_path, **read_options)
+    cleaned, report = clean(df, rules, derived)
+    return cleaned, report, len(df)
+
+
+def clean_many(dataset, input_paths, output_path=None, workers=None):
+    """Cleans every input file in a process pool, returns the merged DataFrame and the summed report"""
+    rules = DATASETS[dataset][0]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # .map() returns the results in the order of input_paths, whichever worker finishes first,
+        # so the merged file is the same on every run
+        results = list(pool.map(clean_partition, [dataset] * len(input_paths), input_paths))
+    report = {rule.name: 0 for rule in rules}
+    for cleaned, partition_report, rows in results:
+        for name, dropped in partition_report.items():
+            report[name] += dropped
+    rows_before = sum(rows for cleaned, partition_report, rows in results)
+    merged = pd.concat([cleaned for cleaned, partition_report, rows in results], ignore_index=True)
+    # every worker only saw its own file, so rows that appear in two files are removed here, keeping the first one
+    duplicates = merged.duplicated().to_numpy()
+    if duplicates.any():
+        merged = merged[~duplicates].reset_index(drop=True)
+        report["duplicates across files"] = int(duplicates.sum())
+    print_report(report, rows_before, len(merged))
+    if output_path is not None:
+        merged.to_csv(output_path, sep=",")
+    return merged, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleans many survey exports in parallel")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("output")
+    parser.add_argument("inputs", nargs="+")
+    parser.add_argument("--workers", type=int, help="number of worker processes, default is one per core")
+    args = parser.parse_args()
+    clean_many(args.dataset, args.inputs, args.output, args.workers)
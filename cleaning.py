@@ -0,0 +1,213 @@
+"""Declarative cleaning rules that are combined into one row mask and applied to a DataFrame in one pass"""
+
+import operator     # comparison functions for the cross-field rules
+
+import numpy as np      # boolean masks are combined as numpy arrays
+import pandas as pd     # the rules are evaluated on DataFrame columns
+
+# operators that can be used in a Forbid rule, they all work element-wise on numpy arrays
+OPERATORS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+             "in": np.isin, "not in": lambda values, options: ~np.isin(values, options)}
+
+
+class Rule():
+    """Modeling a cleaning rule that decides which rows are kept"""
+    columns = None      # columns the rule reads, None means that it needs the whole DataFrame
+
+    def __init__(self, name):
+        """Every rule has a name that is used in the report of dropped rows"""
+        self.name = name
+
+    def check(self, arrays):
+        """Returns a boolean numpy array, True for the rows that pass, from a dictionary of column arrays"""
+        raise NotImplementedError
+
+    def keep(self, df):
+        """Returns a boolean numpy array, True for the rows that pass the rule"""
+        return self.check({column: df[column].to_numpy() for column in self.columns})
+
+    def keep_chunk(self, df):
+        """Same as keep() for one chunk of a larger file, rules that need earlier chunks override it"""
+        return self.keep(df)
+
+    def reset(self):
+        """Forgets what was seen in earlier chunks"""
+
+
+class Unique(Rule):
+    """Modeling the removal of duplicate rows, the first copy is kept"""
+    def __init__(self, name="duplicates"):
+        super().__init__(name)
+        # 64-bit hashes of the rows of earlier chunks, kept as a few sorted runs, largest first
+        # a chunk only adds its own run, runs are merged when the newer one is at least half as big as the one before it
+        # so every hash is merged O(log n) times instead of re-sorting all seen hashes for every chunk
+        self.runs = []
+
+    def keep(self, df):
+        return ~df.duplicated().to_numpy()
+
+    def is_seen(self, hashes):
+        """Returns a boolean array, True for the hashes that are in one of the runs"""
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            seen |= run[positions] == hashes
+        return seen
+
+    def add_run(self, hashes):
+        """Adds sorted new hashes as a run and merges runs of similar size"""
+        self.runs.append(hashes)
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            newer = self.runs.pop()
+            # the stable sort of numpy is a timsort for 64-bit numbers, it merges two sorted runs in linear time
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], newer]), kind="stable")
+
+    def keep_chunk(self, df):
+        # a row is hashed into 8 bytes, so only the hashes of earlier chunks are kept in memory, not the rows
+        # numbers are hashed as float64, because a column can be read as int in one chunk and as float in another
+        numeric = df.select_dtypes("number").columns
+        hashes = pd.util.hash_pandas_object(df.astype(dict.fromkeys(numeric, "float64")), index=False).to_numpy()
+        mask = ~pd.Series(hashes).duplicated().to_numpy()       # duplicates inside this chunk
+        mask &= ~self.is_seen(hashes)       # duplicates of rows from earlier chunks
+        if mask.any():      # the kept rows are new and unique, so their hashes are a run of their own
+            self.add_run(np.sort(hashes[mask]))
+        return mask
+
+    def reset(self):
+        self.runs = []
+
+
+class NotNull(Rule):
+    """Modeling the removal of rows with at least one missing value in the given columns"""
+    def __init__(self, columns=None, name="missing values"):
+        super().__init__(name)
+        self.columns = columns      # None means every column, like .dropna(how="any")
+
+    def keep(self, df):
+        values = df if self.columns is None else df[self.columns]
+        return values.notna().all(axis=1).to_numpy()
+
+    def check(self, arrays):
+        mask = np.ones(len(arrays[self.columns[0]]), dtype=bool)
+        for column in self.columns:
+            mask &= ~pd.isna(arrays[column])
+        return mask
+
+
+class Range(Rule):
+    """Modeling the legal range of a numeric column"""
+    def __init__(self, column, low=None, high=None, low_inclusive=True, high_inclusive=True, name=None):
+        super().__init__(name or column + " range")
+        self.column = column
+        self.columns = [column]
+        self.low = low
+        self.high = high
+        self.low_inclusive = low_inclusive
+        self.high_inclusive = high_inclusive
+
+    def check(self, arrays):
+        values = arrays[self.column]
+        mask = np.ones(len(values), dtype=bool)
+        # comparisons with NaN are False, so missing values never pass a range rule
+        if self.low is not None:
+            mask &= values >= self.low if self.low_inclusive else values > self.low
+        if self.high is not None:
+            mask &= values <= self.high if self.high_inclusive else values < self.high
+        return mask
+
+
+class OneOf(Rule):
+    """Modeling a whitelist of legal values in a column"""
+    def __init__(self, column, values, name=None):
+        super().__init__(name or column + " values")
+        self.column = column
+        self.columns = [column]
+        self.values = list(values)
+
+    def check(self, arrays):
+        return np.isin(arrays[self.column], self.values)
+
+
+class Forbid(Rule):
+    """Modeling an illegal combination of values, a row is dropped when every condition is true"""
+    def __init__(self, conditions, name):
+        # conditions is a list of (column, operator, value), for example ("Cycling_Frequency", "==", 1)
+        super().__init__(name)
+        self.conditions = [(column, OPERATORS[op], value) for column, op, value in conditions]
+        self.columns = list(dict.fromkeys(column for column, op, value in conditions))
+
+    def check(self, arrays):
+        illegal = np.ones(len(arrays[self.columns[0]]), dtype=bool)
+        for column, compare, value in self.conditions:
+            illegal &= compare(arrays[column], value)
+        return ~illegal
+
+
+class Bins():
+    """Modeling a new ordinal categorical column made by binning a numeric column with pd.cut"""
+    def __init__(self, column, new_column, bins, labels):
+        self.column = column
+        self.new_column = new_column
+        self.bins = bins        # bins must always be 1 more than labels
+        self.labels = labels
+
+    def apply(self, df):
+        """Adds the new column to the DataFrame"""
+        df[self.new_column] = pd.cut(df[self.column], bins=self.bins, labels=self.labels)
+
+
+def validate(df, rules, chunk=False):
+    """Returns the keep mask, the rows dropped per rule and the violations per rule, in one pass over the columns"""
+    # every column that a rule reads is taken out of the DataFrame once as a numpy array and shared by the rules
+    needed = dict.fromkeys(column for rule in rules if rule.columns is not None for column in rule.columns)
+    arrays = {column: df[column].to_numpy() for column in needed}
+    keep = np.ones(len(df), dtype=bool)
+    dropped = {}
+    violations = {}
+    for rule in rules:
+        if rule.columns is None:        # rules like Unique need the whole frame
+            rule_keep = rule.keep_chunk(df) if chunk else rule.keep(df)
+        else:
+            rule_keep = rule.check(arrays)
+        violations[rule.name] = int(np.count_nonzero(~rule_keep))       # every row that breaks this rule
+        # a row is counted as dropped for the first rule that drops it, like running the rules one after another
+        dropped[rule.name] = int(np.count_nonzero(keep & ~rule_keep))
+        keep &= rule_keep
+    return keep, dropped, violations
+
+
+def clean(df, rules, derived=(), chunk=False):
+    """Applies the rules with one combined mask, returns the cleaned DataFrame and a report of dropped rows per rule"""
+    # chunk=True means that df is one part of a bigger file and rules like Unique remember the earlier parts
+    keep, report, violations = validate(df, rules, chunk)
+    cleaned = df[keep].copy()       # the only copy of the data
+    for column in derived:
+        column.apply(cleaned)
+    return cleaned, report
+
+
+def clean_csv_streaming(input_path, output_path, rules, derived=(), chunksize=100000, read_options=None, sep=","):
+    """Cleans a csv file chunk by chunk and appends every cleaned chunk to the output, returns the summed report"""
+    # only one chunk and the hashes of the unique rows are in memory at a time, so the input can be bigger than RAM
+    for rule in rules:
+        rule.reset()
+    report = {rule.name: 0 for rule in rules}
+    rows_before = rows_after = 0
+    chunks = pd.read_csv(input_path, chunksize=chunksize, **(read_options or {}))
+    for number, chunk in enumerate(chunks):
+        cleaned, chunk_report = clean(chunk, rules, derived, chunk=True)
+        for name, dropped in chunk_report.items():
+            report[name] += dropped
+        rows_before += len(chunk)
+        rows_after += len(cleaned)
+        # the index of the chunks continues from the previous chunk, so the file looks like one .to_csv() call
+        cleaned.to_csv(output_path, sep=sep, mode="w" if number == 0 else "a", header=number == 0)
+    return report, rows_before, rows_after
+
+
+def print_report(report, rows_before, rows_after):
+    """Prints how many rows each rule dropped"""
+    print("Rows before cleaning: {}".format(rows_before))
+    for name, dropped in report.items():
+        print("  {}: {} rows dropped".format(name, dropped))
+    print("Rows after cleaning: {}".format(rows_after))
@@ -0,0 +1,187 @@
+"""One command line for the whole project: clean, plot, train, predict and play
+
+every subcommand imports only the modules it needs when it runs, so starting
+a hangman game or classifying a headline does not load pandas, seaborn or scikit-learn
+
+    python cli.py clean helmets
+    python cli.py plot --clouds
+    python cli.py train
+    python cli.py predict "some headline"
+    python cli.py play
+    python cli.py importtime
+"""
+
+import argparse     # subcommands and their options
+import os       # checks if the numpy scorer table exists
+import re       # parses the -X importtime output
+import subprocess       # the import benchmark starts a fresh interpreter per subcommand
+import sys      # path of the interpreter and stdin of predict
+import time     # wall clock time of the import benchmark
+
+# modules each subcommand imports when it runs, used by the import benchmark
+COMMAND_MODULES = {"clean": ["helmets_cleaning", "data_prob_2"],
+                   "plot": ["plot_report", "figures"],
+                   "train": ["sarcasm_model", "pandas", "sklearn.feature_extraction.text", "sklearn.naive_bayes"],
+                   "predict": ["sarcasm_scorer"],
+                   "play": ["session05_hangman"]}
+# what predict imports instead when there is no scorer table, it then also unpickles the scikit-learn model
+PREDICT_FALLBACK_MODULES = ["sarcasm_scorer", "sarcasm_model", "sklearn.feature_extraction.text", "sklearn.naive_bayes"]
+
+
+def run_clean(args):
+    """Cleans a dataset, the same as running helmets_cleaning.py or data_prob_2.py"""
+    if args.dataset == "helmets":
+        from helmets_cleaning import clean_helmets, clean_helmets_streaming
+        if args.chunksize:
+            clean_helmets_streaming(chunksize=args.chunksize)
+        else:
+            clean_helmets()
+    else:
+        from data_prob_2 import build_exam_dataset
+        build_exam_dataset(chunksize=args.chunksize, force=args.force)
+
+
+def run_plot(args):
+    """Renders the figures, and the word clouds if asked, to image files"""
+    from plot_report import render_report
+    render_report(args.names, args.output, args.formats.split(","), args.workers, args.budget)
+    if args.clouds:
+        from wordcloud_report import render_clouds, sarcasm_clouds
+        render_clouds(sarcasm_clouds(), os.path.join(args.output, "clouds"), args.workers)
+
+
+def run_train(args):
+    """Trains and saves the sarcasm model, and exports the numpy scorer table that predict starts from"""
+    from sarcasm_model import train_model, save_model
+    vectorizer, model = train_model(args.input, args.streaming, args.chunksize)
+    save_model(vectorizer, model, args.model)
+    print("Saved the model to", args.model)
+    from sarcasm_scorer import SCORER_PATH, export_scorer
+    if not args.streaming:      # every CountVectorizer model gets its table, so predict never needs scikit-learn
+        export_scorer(vectorizer, model, SCORER_PATH)
+        print("Saved the scorer table to", SCORER_PATH)
+    elif os.path.exists(SCORER_PATH):
+        # hashed features have no vocabulary to export, and a table of the old model would keep giving the old labels
+        os.remove(SCORER_PATH)
+        print("Removed the old scorer table", SCORER_PATH)
+
+
+def run_predict(args):
+    """Classifies headlines given as arguments, or one per line on stdin"""
+    headlines = args.headlines
+    if not headlines:
+        headlines = [input("Enter a Text: ")] if sys.stdin.isatty() else [line.rstrip("\n") for line in sys.stdin]
+    from sarcasm_scorer import SCORER_PATH
+    if os.path.exists(SCORER_PATH):     # numpy only, starts in milliseconds
+        from sarcasm_scorer import SarcasmScorer
+        labels = SarcasmScorer(SCORER_PATH).predict(headlines)
+    else:       # no exported table yet, the pickled scikit-learn model is slower to load
+        from sarcasm_model import MODEL_PATH, load_model, classifier
+        labels = classifier(*load_model(MODEL_PATH))(headlines)
+    for headline, label in zip(headlines, labels):
+        print("{}\t{}".format(label, headline))
+
+
+def run_play(args):
+    """Plays hangman in the terminal, or serves games to other programs"""
+    if args.server:
+        from hangman_server import main
+        main(["--stdio"] if args.stdio else ["--port", str(args.port)])
+    else:
+        from session05_hangman import play
+        play()
+
+
+def import_time(modules):
+    """Returns the microseconds a fresh interpreter spends importing the modules, after importing this file"""
+    code = "import cli\n" + "".join("import {}\n".format(module) for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:      # a package that is not installed
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    # lines look like "import time:       120 |        850 | module", nested imports have more spaces before the name
+    # the cumulative times of the top level imports after cli add up to the cost of the subcommand's modules
+    total = 0
+    after_cli = False
+    for cumulative, name in re.findall(r"import time:\s+\d+ \|\s+(\d+) \|( +\S+)", result.stderr):
+        if name.startswith(" ") and not name.startswith("  "):
+            if after_cli:
+                total += int(cumulative)
+            after_cli = after_cli or name.strip() == "cli"
+    return total
+
+
+def run_importtime(args):
+    """Prints how long each subcommand takes to import what it needs, and to start a fresh interpreter with it"""
+    from sarcasm_scorer import SCORER_PATH
+    slow = []
+    for command, modules in COMMAND_MODULES.items():
+        if command == "predict" and not os.path.exists(SCORER_PATH):
+            # predict falls back to the pickled model, so that is what its start up costs
+            print("Warning: there is no {}, predict imports scikit-learn, run cli.py train".format(SCORER_PATH))
+            modules = PREDICT_FALLBACK_MODULES
+        start = time.perf_counter()
+        try:
+            imports = import_time(modules)
+        except ImportError as error:
+            print("{:<8} {}".format(command, error))
+            continue
+        wall = time.perf_counter() - start      # interpreter start up included, like a real cold start
+        print("{:<8} imports {:7.1f} ms, process {:7.1f} ms".format(command, imports / 1000, 1000 * wall))
+        if command in ("play", "predict") and wall > args.budget:
+            slow.append(command)
+    for command in slow:
+        print("Warning: {} took longer than {:.2f} s to start".format(command, args.budget))
+
+
+def make_parser():
+    """Returns the argument parser with every subcommand"""
+    parser = argparse.ArgumentParser(description="Cleaning, plotting, sarcasm detection and hangman from one command")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    clean = commands.add_parser("clean", help="clean a dataset")
+    clean.add_argument("dataset", choices=["dataprob2", "helmets"])
+    clean.add_argument("--chunksize", type=int, help="read and clean the input in chunks of this many rows")
+    clean.add_argument("--force", action="store_true", help="clean DataProb2 even if the input and the rules did not change")
+    clean.set_defaults(run=run_clean)
+
+    plot = commands.add_parser("plot", help="render the figures to image files")
+    plot.add_argument("names", nargs="*", help="figures to render, all of them by default")
+    plot.add_argument("--output", default="report")
+    plot.add_argument("--formats", default="png,svg", help="comma separated, for example png,svg")
+    plot.add_argument("--workers", type=int, help="number of worker processes, default is one per core")
+    plot.add_argument("--budget", type=float, help="warn when rendering takes longer than this many seconds")
+    plot.add_argument("--clouds", action="store_true", help="also render the word clouds of Sarcasm.json")
+    plot.set_defaults(run=run_plot)
+
+    train = commands.add_parser("train", help="train and save the sarcasm model")
+    train.add_argument("--input", default="Sarcasm.json")
+    train.add_argument("--model", default="sarcasm_model.pkl")
+    train.add_argument("--streaming", action="store_true", help="train chunk by chunk with hashed features, predict then loads the pickled model")
+    train.add_argument("--chunksize", type=int, default=10000)
+    train.set_defaults(run=run_train)
+
+    predict = commands.add_parser("predict", help="classify headlines as sarcasm or not")
+    predict.add_argument("headlines", nargs="*", help="headlines to classify, read from stdin if there are none")
+    predict.set_defaults(run=run_predict)
+
+    play = commands.add_parser("play", help="play hangman")
+    play.add_argument("--server", action="store_true", help="run the hangman game server instead")
+    play.add_argument("--stdio", action="store_true", help="serve on stdin/stdout instead of a TCP socket")
+    play.add_argument("--port", type=int, default=5005)
+    play.set_defaults(run=run_play)
+
+    importtime = commands.add_parser("importtime", help="measure the start up time of every subcommand")
+    importtime.add_argument("--budget", type=float, default=0.5, help="warn when play or predict start slower than this")
+    importtime.set_defaults(run=run_importtime)
+    return parser
+
+
+def main(argv=None):
+    """Runs the subcommand given on the command line"""
+    args = make_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,102 @@
 """Program that loads and cleans DataProb2.csv and saves the clean dataset in a new csv file"""
 
+import argparse     # command line option for the streaming mode
 import pandas as pd     # pandas package imported with an alias. Used for reading csv file and working with DataFrame
+from build_cache import is_fresh, record_build      # skips cleaning when the input and the rules did not change
+from exam_schema import cache_folder_for, load_exam_dataset, write_exam_cache       # compact dtypes and the .npy cache read by data_prob_graphs.py
+from cleaning import Unique, NotNull, Range, OneOf, Bins, clean, clean_csv_streaming, print_report     # declarative cleaning rules, applied with one combined mask
 
-### CLEANING THE DATA
+### CLEANING RULES
 
-exam_df = pd.read_csv('DataProb2.csv', delimiter=";")
-# function to read csv files as DataFrame objects
-# file path of an existing file given. Delimiter is how data is separated in the csv file, it could also be "," fx
+RULES_VERSION = 1
+# has to be increased whenever the rules below change, otherwise the cached exam_dataset.csv is reused
 
-description = exam_df.describe()
-# creates a DataFrame with descriptive statistics
+# what I found when exploring the data with .describe() and .groupby().agg():
 # multiple categories with missing values
 # max values in JFC and HINT are outliers
 # profile has undefined values
 # NumbAnswers and LogPeriod could have some outlier values
+DATAPROB2_RULES = [
+    Unique(),
+    # a good safety measure, although there are no duplicates in this dataset
+    NotNull(),
+    # 9 categories have missing values
+    # a row is removed if there is at least one empty value, like .dropna(axis=0, how='any')
+    Range("JFC_fitting", high=5, high_inclusive=False),
+    Range("HINT_fitting", high=5, high_inclusive=False),
+    # each variable has one outlier value of 999.0 that needs to be removed
+    # one row is removed
+    OneOf("Profile", ["A", "B", "C", "D"]),
+    # 2 undefined values for Profile, the rest are A B C D
+    # the 2 rows with undefined Profile values are removed
+    Range("LogPeriod", high=100),
+    # NumbAnswers have some numbers above 2000, but I decided not to clean them, because I dont know what this data represents
+    # LogPeriod has one value significantly above 100 (147), which could be an outlier
+    # one row removed
+]
+
+DATAPROB2_DERIVED = [
+    Bins("RespRate", "RespRateLevel", bins=[0, 0.2, 1], labels=["low", "high"]),
+    # creating a new ordinal categorical variable RespRateLevel and adding it to the DataFrame
+    # third bin could be float("Inf"), but in this dataset there are no values > 1
+    # this variable later used for visualization
+]
+
+
+### CLEANING THE DATA
+
+def clean_dataprob2(input_path="DataProb2.csv", output_path="exam_dataset.csv"):
+    """Cleans the DataProb2 dataset with the rules above and saves it, returns the clean DataFrame and the report"""
+    exam_df = pd.read_csv(input_path, delimiter=";")
+    # function to read csv files as DataFrame objects
+    # file path of an existing file given. Delimiter is how data is separated in the csv file, it could also be "," fx
+
+    exam_df_clean, report = clean(exam_df, DATAPROB2_RULES, DATAPROB2_DERIVED)
+    # every rule is checked on the loaded data and the rows are removed together, so there is only one copy
+    print_report(report, len(exam_df), len(exam_df_clean))
+
+    exam_df_clean.to_csv(output_path, sep=",")
+    # saving the cleaned dataset to a new csv file
+    # sep="," because I like it better that way
+    write_exam_cache(exam_df_clean, cache_folder_for(output_path))
+    # binary copy with compact dtypes, so the readers do not have to parse the csv again
+    return exam_df_clean, report
+
+
+def clean_dataprob2_streaming(input_path="DataProb2.csv", output_path="exam_dataset.csv", chunksize=100000):
+    """Cleans an export that does not fit in memory chunk by chunk with the same rules, returns the report"""
+    report, rows_before, rows_after = clean_csv_streaming(input_path, output_path, DATAPROB2_RULES, DATAPROB2_DERIVED,
+                                                          chunksize=chunksize, read_options={"delimiter": ";"})
+    print_report(report, rows_before, rows_after)
+    # the output may not fit in memory, so the .npy cache is not written here
+    # load_exam_dataset() sees that the csv is newer than the old cache and rebuilds it
+    return report
+
+
+def build_exam_dataset(input_path="DataProb2.csv", output_path="exam_dataset.csv", chunksize=None, force=False):
+    """Cleans the input only if it or the rules changed since the last build, returns True if it was cleaned"""
+    if not force and is_fresh(input_path, output_path, RULES_VERSION):
+        return False
+    if chunksize:
+        clean_dataprob2_streaming(input_path, output_path, chunksize)
+    else:
+        clean_dataprob2(input_path, output_path)
+    record_build(input_path, output_path, RULES_VERSION)
+    return True
+
+
+def get_clean_dataset(input_path="DataProb2.csv", output_path="exam_dataset.csv"):
+    """Returns the cleaned dataset, cleaning it first only if the cached one is out of date"""
+    build_exam_dataset(input_path, output_path)
+    return load_exam_dataset(output_path)       # memory-mapped .npy cache, no csv parsing
+
 
-exam_df = exam_df.drop_duplicates()
-# a good safety measure, although there are no duplicates in this dataset
-
-exam_df.isnull().any()
-# 9 categories have missing values
-exam_df = exam_df.dropna(axis=0, how='any')
-# .dropna() method removes missing values
-# axis = 0 means rows (1 would be columns)
-# how="any" means that the row is removed if there is at least one empty value
-# both parameters are defaults, so there was no need to specify them here
-
-exam_df.groupby('JFC_fitting').agg({'JFC_fitting':['count']})
-exam_df.groupby('HINT_fitting').agg({'HINT_fitting':['count']})
-# .groupby() and .agg() methods are used together
-# .agg() counts how many condition values are in each group
-# each variable has one outlier value of 999.0 that needs to be removed
-exam_df = exam_df[(exam_df.JFC_fitting<5) & (exam_df.HINT_fitting<5)]
-# Series intersection between legal JFC and HINT values
-# one row is removed
-
-exam_df.groupby('Profile').agg({'Profile':['count']})
-# 2 undefined values for Profile, the rest are A B C D
-exam_df = exam_df[(exam_df.Profile=="A") | (exam_df.Profile=="B") | (exam_df.Profile=="C") | (exam_df.Profile=="D")]
-# Series union with profiles A B C and D
-# the 2 rows with undefined Profile values are removed
-
-exam_df.groupby('NumbAnswers').agg({'NumbAnswers':['count']})
-exam_df.groupby('LogPeriod').agg({'LogPeriod':['count']})
-# NumbAnswers have some numbers above 2000, but I decided not to clean them, because I dont know what this data represents
-# LogPeriod has one value significantly above 100 (147), which could be an outlier
-exam_df = exam_df[(exam_df.LogPeriod<=100)]
-# one row removed
-
-exam_df["RespRateLevel"] = pd.cut(exam_df["RespRate"], bins=[0, 0.2, 1], labels=["low", "high"])
-# creating a new ordinal categorical variable RespRateLevel and adding it to the DataFrame
-# .cut() method takes an array (a variable "RespRate" from the DataFrame in this case)
-# bins must always be 1 more than labels
-# third bin could be float("Inf"), but in this dataset there are no values > 1
-# this variable later used for visualization
-
-description = exam_df.describe()
-# check the descriptive DataFrame again, data looks much cleaner
-
-exam_df.to_csv("exam_dataset.csv", sep=",")
-# saving the cleaned dataset to a new csv file
-# sep="," because I like it better that way
-
-print("Your data is cleaned!")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleans DataProb2.csv into exam_dataset.csv")
+    parser.add_argument("--chunksize", type=int, help="read and clean the input in chunks of this many rows")
+    parser.add_argument("--force", action="store_true", help="clean even if the input and the rules did not change")
+    args = parser.parse_args()
+    if build_exam_dataset(chunksize=args.chunksize, force=args.force):
+        print("Your data is cleaned!")
+    else:
+        print("Nothing changed, exam_dataset.csv is up to date!")
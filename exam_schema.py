@@ -0,0 +1,84 @@
+"""Compact dtypes for the cleaned exam dataset and a binary .npy cache that readers memory-map instead of parsing the csv"""
+
+import json     # categories and dtypes of the cache are saved in a small json file
+import os       # file times decide if the cache is still fresh
+
+import numpy as np      # .npy files and memory mapping
+import pandas as pd     # the dataset is used as a DataFrame
+
+# most of these are ratios between 0 and 1, float32 keeps 7 significant digits which is more than the survey has
+FLOAT_COLUMNS = ["JFC_fitting", "HINT_fitting", "AverageDailyUseTime", "Speech", "Quality", "Noise", "Loudness",
+                 "Fatigue", "Use", "Fit", "QoL", "All", "RespRate"]
+EXAM_DTYPES = {"ID": "int32",
+               "NumbAnswers": "int32",
+               "LogPeriod": "int16",       # at most 100 after cleaning
+               **{column: "float32" for column in FLOAT_COLUMNS}}
+EXAM_CATEGORIES = {"Profile": (["A", "B", "C", "D"], False),
+                   "RespRateLevel": (["low", "high"], True)}       # ordinal, low < high like pd.cut made it
+
+
+
+def cache_folder_for(csv_path):
+    """Returns the cache folder that belongs to a csv file, exam_dataset.csv -> exam_dataset_cache"""
+    return os.path.splitext(csv_path)[0] + "_cache"
+
+
+def apply_schema(df):
+    """Returns the DataFrame with the compact dtypes of the exam dataset"""
+    df = df.astype({column: dtype for column, dtype in EXAM_DTYPES.items() if column in df.columns})
+    for column, (categories, ordered) in EXAM_CATEGORIES.items():
+        if column in df.columns:
+            df[column] = pd.Categorical(df[column], categories=categories, ordered=ordered)
+    return df
+
+
+def read_exam_csv(path="exam_dataset.csv"):
+    """Reads the cleaned csv with the compact dtypes, the unnamed first column becomes the index again"""
+    return apply_schema(pd.read_csv(path, sep=",", index_col=0))
+
+
+def write_exam_cache(df, folder):
+    """Saves every column as a .npy file, categories are saved as small integer codes"""
+    df = apply_schema(df)
+    os.makedirs(folder, exist_ok=True)
+    schema_path = os.path.join(folder, "schema.json")
+    if os.path.exists(schema_path):
+        os.remove(schema_path)      # an old cache must not be read while its columns are being replaced
+    schema = {"columns": list(df.columns), "categories": {}}
+    np.save(os.path.join(folder, "index.npy"), df.index.to_numpy())
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            schema["categories"][column] = [list(values.cat.categories), bool(values.cat.ordered)]
+            values = values.cat.codes       # int8, -1 for a missing value
+        np.save(os.path.join(folder, column + ".npy"), values.to_numpy())
+    # the schema file is written last, so a cache without it is never read
+    with open(schema_path, "w") as schema_file:
+        json.dump(schema, schema_file)
+
+
+def read_exam_cache(folder):
+    """Builds the DataFrame from memory-mapped .npy files, no text is parsed"""
+    with open(os.path.join(folder, "schema.json")) as schema_file:
+        schema = json.load(schema_file)
+    columns = {}
+    for column in schema["columns"]:
+        values = np.load(os.path.join(folder, column + ".npy"), mmap_mode="r")     # pages are read only when used
+        if column in schema["categories"]:
+            categories, ordered = schema["categories"][column]
+            values = pd.Categorical.from_codes(values, categories=categories, ordered=ordered)
+        columns[column] = values
+    index = np.load(os.path.join(folder, "index.npy"), mmap_mode="r")
+    # copy=False lets pandas keep the memory maps where it can, columns of the same dtype may still be combined into one block
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def load_exam_dataset(csv_path="exam_dataset.csv"):
+    """Returns the cleaned dataset from the cache, the cache is rebuilt from the csv when it is missing or older"""
+    folder = cache_folder_for(csv_path)
+    schema_path = os.path.join(folder, "schema.json")
+    if os.path.exists(schema_path) and os.path.getmtime(schema_path) >= os.path.getmtime(csv_path):
+        return read_exam_cache(folder)
+    df = read_exam_csv(csv_path)
+    write_exam_cache(df, folder)
+    return df
@@ -1,10 +1,10 @@
-"""CountVectorizer objects and wordclouds for points 2,3 and 4 in the exam"""
+"""CountVectorizer settings and wordclouds for points 2,3 and 4 in the exam"""
 
 import pandas as pd     # pandas package imported with an alias. Used for reading json file and working with DataFrame
-from sklearn.feature_extraction.text import CountVectorizer     # class from sklearn package whose objects tokenize and count occurrences
 from wordcloud import WordCloud     # class from wordcloud package for generating wordclouds
 from matplotlib import pyplot as plt    # pyplot interface from matplotlib package imported
 import numpy as np      # numpy package imported with an alias. Used for working with  numpy arrays, here used for mask
+from ngram_counter import count_frequencies, CLOUD_WORDS, EXAM_CLOUDS        # word and n-gram frequencies of many vectorizer settings in one pass
 
 ### loading the data
 data = pd.read_json("Sarcasm.json", lines=True)
@@ -16,91 +16,27 @@ data["is_sarcastic"] = data["is_sarcastic"].map({0: "Not Sarcasm", 1: "Sarcasm"}
 # link to article not necessary for the model
 data = data[["headline", "is_sarcastic"]]
 
-### 3 different CountVectorizer objects from task #2
+### 3 different CountVectorizer settings from task #2
 
-# words between 5 and 20 letters long
-# analyzer="word" by default
-cv_520 = CountVectorizer(token_pattern=r"\b\w{5,20}\b", decode_error='replace')
-# words with 3 letters or fewer
-# see how token_pattern= changed
-cv_13 = CountVectorizer(token_pattern=r"\b\w{1,3}\b", decode_error='replace')
-# combinations of 3 to 6 words
-# token_pattern= is default, because word length is not given
-# dtype= argument was needed for this instance, otherwise I was getting a MemoryError, because of the array size
-cv_36 = CountVectorizer(ngram_range=(3, 6), decode_error='replace', dtype='uint8')
+# EXAM_CLOUDS in ngram_counter.py holds them as (token_pattern=, ngram_range=), the same settings wordcloud_report.py uses
+# "520": words between 5 and 20 letters long
+# "13": words with 3 letters or fewer, see how token_pattern= changed
+# "36": combinations of 3 to 6 words, token_pattern= is default, because word length is not given
 
 
 ### creating wordclouds
 
-# data is a DataFrame object
-# headline is a Series object in the data object
-# to_list() is a pandas method for Series objects that returns a list of values
-sarcastic_sentences = data[data['is_sarcastic'] == 'Sarcasm'].headline.to_list()
-not_sarcastic_sentences = data[data['is_sarcastic'] == 'Not Sarcasm'].headline.to_list()
-
-# cv_520
-# .fit_transform() method used again to convert list to matrix
-x520_sarcasm = cv_520.fit_transform(sarcastic_sentences)
-# get_feature_names_out() method creates an array of all the different words (feature names) found in cv vocabulary that it go from previous method
-ngrams520_sarcasm = cv_520.get_feature_names_out()
-# frequency of each word sorted in a ndarray
-ngrams520_sarcasm_freq = sum(x520_sarcasm.toarray())
-# empty dictionary for now
-vocab520_sarcasm = {}
-# counter
-i = 0
-# for loop iterates through every element of the array and stores it as a key
-# values are the frequency of the word in the frequency ndarray
-for k in ngrams520_sarcasm:
-    vocab520_sarcasm[k] = ngrams520_sarcasm_freq[i]
-    i += 1
-
-x520_not_sarcasm = cv_520.fit_transform(not_sarcastic_sentences)
-ngrams520_not_sarcasm = cv_520.get_feature_names_out()
-ngrams520_not_sarcasm_freq = sum(x520_not_sarcasm.toarray())
-vocab520_not_sarcasm = {}
-i = 0
-for k in ngrams520_not_sarcasm:
-    vocab520_not_sarcasm[k] = ngrams520_not_sarcasm_freq[i]
-    i += 1
-
-# cv_13
-x13_sarcasm = cv_13.fit_transform(sarcastic_sentences)
-ngrams13_sarcasm = cv_13.get_feature_names_out()
-ngrams13_sarcasm_freq = sum(x13_sarcasm.toarray())
-vocab13_sarcasm = {}
-i = 0
-for k in ngrams13_sarcasm:
-    vocab13_sarcasm[k] = ngrams13_sarcasm_freq[i]
-    i += 1
-
-x13_not_sarcasm = cv_13.fit_transform(not_sarcastic_sentences)
-ngrams13_not_sarcasm = cv_13.get_feature_names_out()
-ngrams13_not_sarcasm_freq = sum(x13_not_sarcasm.toarray())
-vocab13_not_sarcasm = {}
-i = 0
-for k in ngrams13_not_sarcasm:
-    vocab13_not_sarcasm[k] = ngrams13_not_sarcasm_freq[i]
-    i += 1
-
-# cv_36
-x36_sarcasm = cv_36.fit_transform(sarcastic_sentences)
-ngrams36_sarcasm = cv_36.get_feature_names_out()
-ngrams36_sarcasm_freq = sum(x36_sarcasm.toarray())
-vocab36_sarcasm = {}
-i = 0
-for k in ngrams36_sarcasm:
-    vocab36_sarcasm[k] = ngrams36_sarcasm_freq[i]
-    i += 1
-
-x36_not_sarcasm = cv_36.fit_transform(not_sarcastic_sentences)
-ngrams36_not_sarcasm = cv_36.get_feature_names_out()
-ngrams36_not_sarcasm_freq = sum(x36_not_sarcasm.toarray())
-vocab36_not_sarcasm = {}
-i = 0
-for k in ngrams36_not_sarcasm:
-    vocab36_not_sarcasm[k] = ngrams36_not_sarcasm_freq[i]
-    i += 1
+# count_frequencies() from ngram_counter.py reads every headline once and counts the words and n-grams
+# of all three vectorizer settings, for sarcastic and not sarcastic headlines at the same time
+# before, each vectorizer was fitted twice, so the headlines were tokenized six times
+# only the CLOUD_WORDS most frequent ones are kept, a wordcloud does not draw more than that anyway
+vocab = count_frequencies(data["headline"], data["is_sarcastic"], EXAM_CLOUDS, CLOUD_WORDS)
+vocab520_sarcasm = vocab["520"]["Sarcasm"]
+vocab520_not_sarcasm = vocab["520"]["Not Sarcasm"]
+vocab13_sarcasm = vocab["13"]["Sarcasm"]
+vocab13_not_sarcasm = vocab["13"]["Not Sarcasm"]
+vocab36_sarcasm = vocab["36"]["Sarcasm"]
+vocab36_not_sarcasm = vocab["36"]["Not Sarcasm"]
 
 # wordclouds
 
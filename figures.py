@@ -0,0 +1,343 @@
+"""Figures of the DataProb2 and helmets datasets, one function per figure that returns the matplotlib Figure"""
+
+import numpy as np      # numpy package imported with an alias. Used for the histogram bin widths and the common KDE grid
+import seaborn as sns   # seaborn package imported with an alias. Used for data visualization based on matplotlib and integrates well with pandas
+import matplotlib.pyplot as plt     # pyplot interface from matplotlib package imported
+import plot_stats       # regression lines, confidence bands and KDE curves computed once and cached
+
+
+LARGE_N = 50000     # above this many rows the figures switch to density plots, samples and summary boxes
+SAMPLE_SIZE = 20000     # points drawn in a scatterplot of a large dataset
+
+
+def is_large(df):
+    """Returns True if drawing every row would make the figure slow and heavy"""
+    return len(df) > LARGE_N
+
+
+def sample_rows(df):
+    """Returns the DataFrame itself, or a reservoir sample of SAMPLE_SIZE rows if it is large"""
+    return plot_stats.reservoir_sample([df], SAMPLE_SIZE) if is_large(df) else df
+
+
+def levels(df, column):
+    """Returns the values of a column in the order seaborn uses, categories keep their own order"""
+    if hasattr(df[column], "cat"):
+        return [level for level in df[column].cat.categories if (df[column] == level).any()]
+    return sorted(df[column].dropna().unique())
+
+
+### DRAWING PRECOMPUTED STATISTICS
+# seaborn's lmplot, jointplot and displot(kde=True) compute the bootstrap and the KDE again on every render,
+# these helpers draw the same kind of figures from plot_stats, so a re-render only draws lines
+
+
+def hue_palette(df, hue):
+    """Returns hue value -> color, shared by the seaborn plot and the lines drawn on top of it"""
+    if hue is None:
+        return None
+    hue_levels = levels(df, hue)
+    return dict(zip(hue_levels, sns.color_palette(n_colors=len(hue_levels))))
+
+
+def draw_regression(data, x, y, stats, by, color=None, label=None, **kwargs):
+    """Draws the points of one facet and its precomputed regression line and confidence band"""
+    ax = plt.gca()
+    fit = stats[tuple(data[column].iloc[0] for column in by)]
+    if is_large(data) and label is None:        # one group in the facet, a density of all rows shows it best
+        ax.hexbin(data[x], data[y], gridsize=40, mincnt=1, cmap="Blues")
+    else:       # several groups in the facet, a sample keeps their colors apart
+        points = sample_rows(data)
+        ax.scatter(points[x], points[y], color=color, label=label, s=20 if len(points) == len(data) else 4, alpha=0.8)
+    ax.plot(fit["grid"], fit["fit"], color=color)
+    if "low" in fit:        # ci=None has no band
+        ax.fill_between(fit["grid"], fit["low"], fit["high"], color=color, alpha=0.15, linewidth=0)
+
+
+def regression_grid(df, x, y, hue=None, col=None, ci=95):
+    """Figure like sns.lmplot, drawn from precomputed fits"""
+    by = [column for column in (hue, col) if column is not None]
+    stats = plot_stats.regression_stats(df, x, y, by, ci)
+    grid = sns.FacetGrid(df, col=col, hue=hue, palette=hue_palette(df, hue), height=5)
+    grid.map_dataframe(draw_regression, x=x, y=y, stats=stats, by=by)
+    grid.set_axis_labels(x, y)
+    if hue is not None:
+        grid.add_legend()
+    return grid
+
+
+def draw_kde(ax, curve, scale, color, vertical=False):
+    """Draws a precomputed KDE curve, scale turns the density into the units of the histogram"""
+    if vertical:
+        ax.plot(curve["density"] * scale, curve["grid"], color=color)
+    else:
+        ax.plot(curve["grid"], curve["density"] * scale, color=color)
+
+
+def bin_width(values, bins):
+    """Returns the width of the histogram bins that seaborn uses for these values"""
+    edges = np.histogram_bin_edges(np.asarray(values, dtype=float), bins=bins)
+    return edges[1] - edges[0]
+
+
+def histogram_grid(df, x, hue=None, col=None, bins="auto", multiple="layer"):
+    """Figure like sns.displot(kde=True), the KDE curves come from plot_stats"""
+    palette = hue_palette(df, hue)
+    grid = sns.displot(df, x=x, hue=hue, col=col, bins=bins, multiple=multiple, palette=palette)
+    by = [column for column in (hue, col) if column is not None]
+    curves = plot_stats.kde_stats(df, x, by)
+    for key, curve in curves.items():
+        values = dict(zip(by, key))
+        facet = df if col is None else df[df[col] == values[col]]
+        ax = grid.ax if col is None else grid.axes_dict[values[col]]
+        color = palette[values[hue]] if hue is not None else sns.color_palette()[0]
+        # seaborn scales the KDE to the histogram counts: density x number of values x bin width
+        draw_kde(ax, curve, curve["count"] * bin_width(facet[x], bins), color)
+    return grid
+
+
+def joint_regression(df, x, y, ci=95):
+    """Figure like sns.jointplot(kind="reg"), drawn from precomputed fits and KDE curves"""
+    fit = plot_stats.regression_stats(df, x, y, (), ci)[()]
+    color = sns.color_palette()[0]
+    grid = sns.JointGrid(data=df, x=x, y=y)
+    if is_large(df):
+        grid.ax_joint.hexbin(df[x], df[y], gridsize=40, mincnt=1, cmap="Blues")
+    else:
+        grid.ax_joint.scatter(df[x], df[y], color=color, s=20, alpha=0.8)
+    grid.ax_joint.plot(fit["grid"], fit["fit"], color=color)
+    if "low" in fit:
+        grid.ax_joint.fill_between(fit["grid"], fit["low"], fit["high"], color=color, alpha=0.15, linewidth=0)
+    sns.histplot(x=df[x], ax=grid.ax_marg_x, color=color)
+    sns.histplot(y=df[y], ax=grid.ax_marg_y, color=color)
+    draw_kde(grid.ax_marg_x, plot_stats.kde_stats(df, x)[()], len(df) * bin_width(df[x], "auto"), color)
+    draw_kde(grid.ax_marg_y, plot_stats.kde_stats(df, y)[()], len(df) * bin_width(df[y], "auto"), color, vertical=True)
+    return grid
+
+
+def stacked_kde(df, x, hue):
+    """Figure like sns.displot(kind="kde", multiple="stack"), drawn from precomputed KDE curves"""
+    curves = plot_stats.kde_stats(df, x, [hue])
+    palette = hue_palette(df, hue)
+    # the curves have their own grids, they are moved to one common grid so they can be stacked
+    grid_x = np.linspace(min(curve["grid"][0] for curve in curves.values()),
+                         max(curve["grid"][-1] for curve in curves.values()), 200)
+    total = sum(curve["count"] for curve in curves.values())
+    fig, ax = plt.subplots(figsize=(6, 5))
+    bottom = np.zeros_like(grid_x)
+    for (level,), curve in sorted(curves.items()):
+        # each curve is weighted by its share of the rows, like seaborn's common_norm
+        density = np.interp(grid_x, curve["grid"], curve["density"], left=0, right=0) * curve["count"] / total
+        ax.fill_between(grid_x, bottom, bottom + density, color=palette[level], alpha=0.5, label=str(level))
+        bottom = bottom + density
+    ax.set_xlabel(x)
+    ax.set_ylabel("Density")
+    ax.legend(title=hue)
+    return fig
+
+
+def box_grid(df, x, y, hue=None):
+    """Figure like sns.catplot(kind="box") drawn from summary statistics, so its cost does not grow with the rows"""
+    x_levels = levels(df, x)
+    hue_levels = levels(df, hue) if hue is not None else [None]
+    palette = hue_palette(df, hue) or {None: sns.color_palette()[0]}
+    width = 0.8 / len(hue_levels)
+    fig, ax = plt.subplots(figsize=(6, 5))
+    for j, hue_level in enumerate(hue_levels):
+        stats, positions = [], []
+        for i, x_level in enumerate(x_levels):
+            rows = df[df[x] == x_level] if hue is None else df[(df[x] == x_level) & (df[hue] == hue_level)]
+            if len(rows):
+                stats.append(plot_stats.box_stats(rows[y]))
+                positions.append(i + (j - (len(hue_levels) - 1) / 2) * width)       # boxes of one x value side by side
+        if stats:
+            ax.bxp(stats, positions=positions, widths=width * 0.9, patch_artist=True,
+                   boxprops={"facecolor": palette[hue_level]}, medianprops={"color": "black"})
+    ax.set_xticks(range(len(x_levels)))
+    ax.set_xticklabels([str(level) for level in x_levels])
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    if hue is not None:
+        ax.legend(handles=[plt.Rectangle((0, 0), 1, 1, color=palette[level]) for level in hue_levels],
+                  labels=[str(level) for level in hue_levels], title=hue)
+    return fig
+
+
+def bar_grid(df, x, y):
+    """Figure like sns.catplot(kind="bar") drawn from precomputed means and confidence intervals"""
+    stats = plot_stats.mean_stats(df, x, y)
+    x_levels = [level for level in levels(df, x) if level in stats]
+    means = np.array([stats[level]["mean"] for level in x_levels])
+    # errorbar() wants the distances below and above each mean
+    errors = np.array([[stats[level]["mean"] - stats[level]["low"] for level in x_levels],
+                       [stats[level]["high"] - stats[level]["mean"] for level in x_levels]])
+    fig, ax = plt.subplots(figsize=(5, 5))
+    ax.bar(range(len(x_levels)), means, color=sns.color_palette(n_colors=len(x_levels)), width=0.8)
+    ax.errorbar(range(len(x_levels)), means, yerr=errors, fmt="none", ecolor=".26", elinewidth=2.5)
+    ax.set_xticks(range(len(x_levels)))
+    ax.set_xticklabels([str(level) for level in x_levels])
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return fig
+
+
+### DATAPROB2
+
+def profiles_ab(exam_df):
+    """Returns the rows with Profile A or B"""
+    exam_df_ab = exam_df[(exam_df.Profile == "A") | (exam_df.Profile == "B")].copy()
+    # instantiating a DataFrame object that only has Profiles with values A or B
+    if hasattr(exam_df_ab.Profile, "cat"):
+        exam_df_ab["Profile"] = exam_df_ab.Profile.cat.remove_unused_categories()
+        # Profile is a category with A B C D, without this seaborn would draw empty plots for C and D
+    return exam_df_ab
+
+
+def dataprob_regression(exam_df):
+    exam_df_ab = profiles_ab(exam_df)
+    grid = regression_grid(exam_df_ab, x="JFC_fitting", y="Speech", col="Profile")
+    # scatterplots with linear regression for Profiles A and B, for variables JFC_fitting and Speech
+    # like .lmplot(), but the regression models are computed once by plot_stats
+    # ci is confidence interval of the regression model, the more narrow the better
+    return grid.figure
+
+
+def dataprob_box(exam_df):
+    exam_df_ab = profiles_ab(exam_df)
+    if is_large(exam_df_ab):
+        return box_grid(exam_df_ab, x="Profile", y="Speech", hue='RespRateLevel')
+    grid = sns.catplot(data=exam_df_ab, x="Profile", y="Speech", kind="box", hue='RespRateLevel')
+    # figure with four box plots, one for each combination of factors, that is A-low, A-high, B-low and B-high
+    # Speech chosen randomly as the other variable, could be any other
+    return grid.figure
+
+
+### HELMETS
+
+def helmets_scatter(helmets_df):
+    fig, ax = plt.subplots()
+    sns.scatterplot(data=sample_rows(helmets_df), x='BART', y='SSS_total', hue='Condition', style='Condition', ax=ax)
+    # a large dataset is drawn as a reservoir sample of its rows
+    # 2 axis (each have an argument), each with a variable from the dataset (data argument). Important to load the cleaned dataset
+    # cap and helmet conditions have different color and style (x vs dot), because it is easier to read
+    return fig
+
+
+def condition(helmets_df, value):
+    """Returns the rows of one condition, 1 = cap and 2 = helmet"""
+    return helmets_df[helmets_df.Condition == value]
+
+
+def helmets_regression_cap(helmets_df):
+    grid = regression_grid(condition(helmets_df, 1), x='BART', y='SSS_total', ci=None)
+    grid.figure.suptitle("condition = cap")
+    # fig.suptitle is from matplotlib and adds a title to the chart
+    return grid.figure
+
+
+def helmets_regression_helmet(helmets_df):
+    grid = regression_grid(condition(helmets_df, 2), x='BART', y='SSS_total', ci=None)
+    grid.figure.suptitle("condition = helmet")
+    return grid.figure
+
+
+def helmets_regression_condition(helmets_df):
+    grid = regression_grid(helmets_df, x='BART', y='SSS_total', hue='Condition')
+    # ci is confidence interval of the regression model, the more narrow the better
+    return grid.figure
+
+
+def helmets_joint_helmet(helmets_df):
+    grid = joint_regression(condition(helmets_df, 2), x='BART', y='SSS_total')
+    grid.figure.suptitle("condition = helmet")
+    # like .jointplot(kind="reg"), both univariate and bivariate graphs
+    # Univariate is a histogram, bivariate is a regression model
+    return grid.figure
+
+
+def helmets_joint_cap(helmets_df):
+    grid = joint_regression(condition(helmets_df, 1), x='BART', y='SSS_total')
+    grid.figure.suptitle("condition = cap")
+    return grid.figure
+
+
+def helmets_regression_sex(helmets_df):
+    grid = regression_grid(helmets_df, x="BART", y="SSS_total", hue="Condition", col="Sex")
+    # regression models of the complete DataFrame, but the col= splits it in 2 graphs depending on the sex value
+    return grid.figure
+
+
+def helmets_histogram(helmets_df):
+    grid = histogram_grid(helmets_df, x='BART', bins=15)
+    # bins is the number of blocks on the x axis
+    # the kernel density estimator is added from plot_stats
+    return grid.figure
+
+
+def helmets_histogram_condition(helmets_df):
+    grid = histogram_grid(helmets_df, x='BART', hue='Condition')
+    # hue differentiates condition
+    return grid.figure
+
+
+def helmets_histogram_sex(helmets_df):
+    grid = histogram_grid(helmets_df, x='BART', hue='Condition', col='Sex', bins=10, multiple='dodge')
+    # col= splits graph based on sex value
+    # multiple= determines if blocks are next to each other or on top (stacked)
+    return grid.figure
+
+
+def helmets_kde(helmets_df):
+    fig = stacked_kde(helmets_df, x='BART', hue='Condition')
+    # kernel density estimation graph, stacked like displot(kind="kde", multiple="stack")
+    # multiple= could be layer or fill, but those dont make sense
+    return fig
+
+
+def helmets_bar(helmets_df):
+    if is_large(helmets_df):
+        return bar_grid(helmets_df, x="Condition", y="BART")
+    grid = sns.catplot(data=helmets_df, x="Condition", y="BART", kind="bar")
+    # black lines are error lines, measures uncertainty of the data
+    return grid.figure
+
+
+def helmets_box(helmets_df):
+    if is_large(helmets_df):
+        return box_grid(helmets_df, x="Condition", y="BART")
+    grid = sns.catplot(data=helmets_df, x="Condition", y="BART", kind="box")
+    # show distribution and outliers
+    return grid.figure
+
+
+def helmets_box_sex(helmets_df):
+    if is_large(helmets_df):
+        return box_grid(helmets_df, x="Condition", y="BART", hue='Sex')
+    grid = sns.catplot(data=helmets_df, x="Condition", y="BART", kind="box", hue='Sex')
+    # boxplot, but also split based on sex
+    return grid.figure
+
+
+# figure name -> (dataset, function), the order is the order of the original scripts
+FIGURES = {"dataprob_regression": ("dataprob2", dataprob_regression),
+           "dataprob_box": ("dataprob2", dataprob_box),
+           "helmets_scatter": ("helmets", helmets_scatter),
+           "helmets_regression_cap": ("helmets", helmets_regression_cap),
+           "helmets_regression_helmet": ("helmets", helmets_regression_helmet),
+           "helmets_regression_condition": ("helmets", helmets_regression_condition),
+           "helmets_joint_helmet": ("helmets", helmets_joint_helmet),
+           "helmets_joint_cap": ("helmets", helmets_joint_cap),
+           "helmets_regression_sex": ("helmets", helmets_regression_sex),
+           "helmets_histogram": ("helmets", helmets_histogram),
+           "helmets_histogram_condition": ("helmets", helmets_histogram_condition),
+           "helmets_histogram_sex": ("helmets", helmets_histogram_sex),
+           "helmets_kde": ("helmets", helmets_kde),
+           "helmets_bar": ("helmets", helmets_bar),
+           "helmets_box": ("helmets", helmets_box),
+           "helmets_box_sex": ("helmets", helmets_box_sex),
+           }
+
+
+def draw_all(dataset, df):
+    """Draws every figure of a dataset, the caller decides if they are shown or saved"""
+    return [function(df) for name, (figure_dataset, function) in FIGURES.items() if figure_dataset == dataset]
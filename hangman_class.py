@@ -1,6 +1,22 @@
 # Class with methods to play hangman
 
-import random       # random package imported, randint method used in one of the class methods here
+from word_store import get_word_store      # shared, indexed SOWPODS dictionary used to pick random words
+
+
+GRAPHICS = ('''_____\n|/  |\n|   O\n|  /|\\\n|  / \\\n|''',
+            '''_____\n|/  |\n|   O\n|  /|\\\n|  / \\\n|''',
+            '''_____\n|/  |\n|   O\n|  /|\\\n|  /\n|''',
+            '''_____\n|/  |\n|   O\n|  /|\\\n|\n|''',
+            '''_____\n|/  |\n|   O\n|  /|\n|\n|''',
+            '''_____\n|/  |\n|   O\n|   |\n|\n|''',
+            '''_____\n|/  |\n|   O\n|\n|\n|''',
+            '''_____\n|/  |\n|\n|\n|\n|''',
+            '')       # a list of strings to draw the gallows
+
+# difficulty levels as constraints on the number of distinct letters the player has to find
+DIFFICULTIES = {"easy": {"max_distinct": 5},
+                "medium": {"min_distinct": 6, "max_distinct": 8},
+                "hard": {"min_distinct": 9}}
 
 
 class Hangman():
@@ -9,35 +25,33 @@ class Hangman():
         """Initializes an object in the hangman class"""
         # not necessary to define any parameters for the class in this case
 
+    def get_hangman_drawing(self, i):       # method has one parameter besides the self
+        """Returns the gallows drawing for a number of guesses left, without printing it"""
+        return GRAPHICS[i]      # number of guesses is an index that determines which string is returned
+
     def draw_hangman(self, i):      # method has one parameter besides the self
         # method to draw hangman
-        graphics = ('''_____\n|/  |\n|   O\n|  /|\\\n|  / \\\n|''',
-                        '''_____\n|/  |\n|   O\n|  /|\\\n|  / \\\n|''',
-                        '''_____\n|/  |\n|   O\n|  /|\\\n|  /\n|''',
-                        '''_____\n|/  |\n|   O\n|  /|\\\n|\n|''',
-                        '''_____\n|/  |\n|   O\n|  /|\n|\n|''',
-                        '''_____\n|/  |\n|   O\n|   |\n|\n|''',
-                        '''_____\n|/  |\n|   O\n|\n|\n|''',
-                        '''_____\n|/  |\n|\n|\n|\n|''',
-                        '')       # a list of strings to draw the gallows
-        print(graphics[i])      # number of guesses is an index that determines which string is printed
+        print(self.get_hangman_drawing(i))
 
     def pick_random_word(self):
             # This method picks a random word from the SOWPODS dictionary.
-            # open the sowpods dictionary as a text file in readable format
+            # the dictionary is memory-mapped and indexed once per process by the word store,
+            # so no file is read and no list of all words is built on each call
 
-        with open("sowpods.txt", 'r') as f:     # sowpods.txt file is opened in reading mode and an object f is instantiated
-            words = f.readlines()       # each line of the file is read and stored as an item on the list called words
-
-            # generate a random index with the help of the random package method randint
-            # -1 because len(words) is not a valid index into the list `words`, because index starts from 0
-        index = random.randint(0, len(words)-1)
-
-            # print out the word at that index
-            # the .strip() function removes all trailing spaces before and after the word
-        word = words[index].strip()     # no spaces in the sowpods file, but this is a good safety measure
+        word = get_word_store("sowpods.txt").random_word()     # random index into the line-offset index, stripped of the newline
         return word     # value is returned to the program that called the method
 
+    def pick_word(self, min_length=1, max_length=255, min_distinct=1, max_distinct=26,
+                  required_letters="", excluded_letters="", difficulty=None):
+        """Picks a random word that matches length, letter-set and difficulty constraints"""
+        # precomputed length, distinct-letter and letter-mask buckets are used, so there is no reject-sampling loop
+        constraints = {"min_length": min_length, "max_length": max_length,
+                       "min_distinct": min_distinct, "max_distinct": max_distinct}
+        if difficulty is not None:
+            constraints.update(DIFFICULTIES[difficulty])        # KeyError for an unknown difficulty name
+        return get_word_store("sowpods.txt").select(required_letters=required_letters,
+                                                    excluded_letters=excluded_letters, **constraints)
+
     def ask_user_for_next_letter(self):
         """Asks user to input their next guess"""
         letter = input("Guess your letter: ")       # built-in input function
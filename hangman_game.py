@@ -0,0 +1,56 @@
+# Class that holds the state of one hangman game, without any input() or print() calls
+
+from word_reveal import WordReveal      # masked word that is updated incrementally
+
+
+class HangmanGame():
+    """Modeling the state of one hangman game"""
+    def __init__(self, word, num_guesses=8):
+        """Starts a game for a word with a number of allowed incorrect guesses"""
+        # since the classic order for hangman game takes 8 lost chances to hang the man
+        self.word = word.upper()
+        self.max_guesses = num_guesses
+        self.num_guesses = num_guesses      # counter that goes down with each incorrect guess
+        self.reveal = WordReveal(self.word)
+        self.correct_letters_guessed = set()
+        self.incorrect_letters_guessed = set()
+
+    def guess(self, letter):
+        """Applies one guess and returns "invalid", "over", "repeat", "correct" or "incorrect" """
+        letter = letter.strip().upper()
+        if len(letter) != 1 or not letter.isalpha():        # one letter at a time
+            return "invalid"
+        if self.is_over():
+            return "over"
+        if letter in self.correct_letters_guessed or letter in self.incorrect_letters_guessed:
+            return "repeat"
+        if self.reveal.reveal(letter):      # number of revealed slots, 0 if the letter is not in the word
+            self.correct_letters_guessed.add(letter)
+            return "correct"
+        self.incorrect_letters_guessed.add(letter)
+        self.num_guesses -= 1       # only incorrect guesses use up a guess
+        return "incorrect"
+
+    def is_won(self):
+        """Returns True if every letter of the word has been guessed"""
+        return self.reveal.is_solved()
+
+    def is_over(self):
+        """Returns True if the game has been won or lost"""
+        return self.num_guesses == 0 or self.is_won()
+
+    def guesses_used(self):
+        """Returns how many incorrect guesses the player has used"""
+        return self.max_guesses - self.num_guesses
+
+    def result(self):
+        """Returns "W" for a won game, "L" for a lost one and None while the game is running"""
+        if self.is_won():
+            return "W"
+        if self.num_guesses == 0:
+            return "L"
+        return None
+
+    def word_string(self):
+        """Returns the word with correctly guessed letters and blank spaces"""
+        return self.reveal.render()
@@ -0,0 +1,145 @@
+# Serves many hangman games from one process with asyncio, over a local TCP socket or stdin/stdout
+#
+# line protocol, one command per line:
+#   NEW [easy|medium|hard]  ->  GAME <id> <masked word> <guesses left>
+#   GUESS <id> <letter>     ->  <id> <result> <masked word> <guesses left> [W|L <word>]
+#   QUIT <id>               ->  BYE <id>
+# anything else is answered with ERROR <message>
+# a connection can only guess or quit the games it started, and its games are dropped when it disconnects
+
+import argparse     # command line options for the port and the stdio mode
+import asyncio      # one event loop multiplexes every connection, there is no thread per player
+import itertools        # count() hands out game ids
+import sys      # stdin and stdout for the stdio mode
+
+from hangman_class import Hangman       # word picking
+from hangman_game import HangmanGame        # pure game state
+
+
+class GameManager():
+    """Modeling a collection of running hangman games"""
+    def __init__(self, on_finish=None):
+        """Creates an empty manager, on_finish(game) is called for every game that is won or lost"""
+        self.hangman = Hangman()
+        self.games = {}     # game id -> HangmanGame
+        self.ids = itertools.count(1)
+        self.on_finish = on_finish
+
+    def new_game(self, owned, difficulty=None):
+        """Starts a game, adds its id to the set of game ids of the connection and returns it"""
+        if difficulty is None:
+            word = self.hangman.pick_random_word()
+        else:
+            word = self.hangman.pick_word(difficulty=difficulty)
+        game_id = next(self.ids)
+        self.games[game_id] = HangmanGame(word)
+        owned.add(game_id)
+        return game_id
+
+    def owned_game(self, owned, game_id):
+        """Returns the game of an id, only if the connection started it"""
+        # ids are handed out in order, so without this check a client could play or quit the games of others
+        if game_id not in owned:
+            raise KeyError(game_id)
+        return self.games[game_id]
+
+    def close_connection(self, owned):
+        """Drops every game a closed connection left unfinished"""
+        for game_id in owned:
+            self.games.pop(game_id, None)
+        owned.clear()
+
+    def handle_line(self, line, owned):
+        """Runs one protocol command of a connection and returns the reply line, owned is the set of its game ids"""
+        parts = line.split()
+        if not parts:
+            return "ERROR empty command"
+        command = parts[0].upper()
+        try:
+            if command == "NEW" and len(parts) <= 2:
+                game_id = self.new_game(owned, parts[1].lower() if len(parts) == 2 else None)
+                game = self.games[game_id]
+                return "GAME {} {} {}".format(game_id, game.word_string().replace(" ", ""), game.num_guesses)
+            if command == "GUESS" and len(parts) == 3:
+                return self.guess(owned, int(parts[1]), parts[2])
+            if command == "QUIT" and len(parts) == 2:
+                game_id = int(parts[1])
+                self.owned_game(owned, game_id)
+                del self.games[game_id]
+                owned.discard(game_id)
+                return "BYE {}".format(game_id)
+        except KeyError as error:       # unknown game id or difficulty
+            return "ERROR unknown {}".format(error)
+        except ValueError:      # game id that is not a number
+            return "ERROR game id must be a number"
+        return "ERROR unknown command"
+
+    def guess(self, owned, game_id, letter):
+        """Applies a guess to a game of the connection and returns the reply line"""
+        game = self.owned_game(owned, game_id)
+        outcome = game.guess(letter)
+        # the masked word is sent without the spaces, so that the reply can be split on whitespace
+        reply = "{} {} {} {}".format(game_id, outcome, game.word_string().replace(" ", ""), game.num_guesses)
+        if game.is_over():
+            del self.games[game_id]     # finished games do not keep using memory
+            owned.discard(game_id)
+            if self.on_finish is not None:
+                self.on_finish(game)
+            reply += " {} {}".format(game.result(), game.word)
+        return reply
+
+
+async def serve_connection(manager, reader, writer):
+    """Answers the commands of one connection until it is closed"""
+    owned = set()       # ids of the games this connection started
+    try:
+        while True:
+            line = await reader.readline()      # waits without blocking the other connections
+            if not line:
+                break
+            writer.write((manager.handle_line(line.decode("ascii", "replace"), owned) + "\n").encode("ascii"))
+            await writer.drain()
+    except ConnectionError:     # the client went away without closing the connection
+        pass
+    finally:
+        manager.close_connection(owned)     # games left by the client are freed
+        writer.close()
+
+
+async def serve_tcp(manager, host="127.0.0.1", port=5005):
+    """Serves the line protocol on a local TCP socket"""
+    server = await asyncio.start_server(lambda r, w: serve_connection(manager, r, w), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def serve_stdio(manager):
+    """Serves the line protocol on stdin and stdout"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    owned = set()       # stdin is one connection
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        sys.stdout.write(manager.handle_line(line.decode("ascii", "replace"), owned) + "\n")
+        sys.stdout.flush()
+    manager.close_connection(owned)
+
+
+def main(argv=None):
+    """Starts the game server"""
+    parser = argparse.ArgumentParser(description="Headless hangman game server")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--stdio", action="store_true", help="use stdin/stdout instead of a TCP socket")
+    args = parser.parse_args(argv)
+    manager = GameManager()
+    if args.stdio:
+        asyncio.run(serve_stdio(manager))
+    else:
+        asyncio.run(serve_tcp(manager, port=args.port))
+
+
+if __name__ == "__main__":
+    main()
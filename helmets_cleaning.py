@@ -0,0 +1,63 @@
+"""Cleaning rules for the helmets dataset of the session07 data analysis workshop"""
+
+import argparse     # command line options for the input, output and streaming mode
+import pandas as pd     # pandas package imported with an alias. Used for reading csv file and working with DataFrame
+from cleaning import Unique, NotNull, Range, OneOf, Forbid, validate, clean, clean_csv_streaming, print_report     # declarative cleaning rules, applied with one combined mask
+
+# every range, enum and cross-field constraint of the dataset is declared once here
+HELMETS_RULES = [
+    Unique(),
+    # why are duplicate data points a problem? erases duplicate rows, like row 7 in dataset
+    NotNull(),
+    # How is an empty cell different from 0? rows 19 and 56 have empty values
+    Range("Age", low=17, high=65),
+    # only rows where the age value is equal or over 17 and equal or under 65, rows 18 and 84 are removed
+    OneOf("Sex", [1, 2]),
+    # since the only values "allowed" are 1 and 2, values 3 and 12 are illegal, 2 rows are removed
+    Range("BART", low=100, high=8500, low_inclusive=False, high_inclusive=False),
+    # assume that MINIMUM BART score = 100; MAXIMUM = 8500, 2 rows are removed
+    Forbid([("Cycling_Frequency", "==", 1), ("Helmet_Use_Likelihood", "!=", 0)], name="helmet use without cycling"),
+    # the person does not cycle, but wears a helmet, because they dont make sense logically - row 73
+]
+
+
+def report_violations(df, rules=HELMETS_RULES):
+    """Returns how many rows break each rule, without removing anything"""
+    keep, dropped, violations = validate(df, rules)
+    return violations
+
+
+def load_clean_helmets(input_path="helmets_data.csv"):
+    """Returns the cleaned helmets dataset without writing any file"""
+    helmets_df, report = clean(pd.read_csv(input_path, delimiter=";"), HELMETS_RULES)
+    return helmets_df
+
+
+def clean_helmets(input_path="helmets_data.csv", output_path="outFile.csv"):
+    """Cleans the helmets dataset and saves it, returns the clean DataFrame and the report of dropped rows"""
+    helmets_df = pd.read_csv(input_path, delimiter=";")
+    helmets_df_clean, report = clean(helmets_df, HELMETS_RULES)
+    print_report(report, len(helmets_df), len(helmets_df_clean))
+    helmets_df_clean.to_csv(output_path)
+    # .to_csv() method writes the DataFrame to csv file, default delimiter is ","
+    return helmets_df_clean, report
+
+
+def clean_helmets_streaming(input_path="helmets_data.csv", output_path="outFile.csv", chunksize=100000):
+    """Cleans a helmets export that does not fit in memory chunk by chunk, returns the report"""
+    report, rows_before, rows_after = clean_csv_streaming(input_path, output_path, HELMETS_RULES,
+                                                          chunksize=chunksize, read_options={"delimiter": ";"})
+    print_report(report, rows_before, rows_after)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleans the helmets dataset")
+    parser.add_argument("input", nargs="?", default="helmets_data.csv")
+    parser.add_argument("output", nargs="?", default="outFile.csv")
+    parser.add_argument("--chunksize", type=int, help="read and clean the input in chunks of this many rows")
+    args = parser.parse_args()
+    if args.chunksize:
+        clean_helmets_streaming(args.input, args.output, chunksize=args.chunksize)
+    else:
+        clean_helmets(args.input, args.output)
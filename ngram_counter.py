@@ -0,0 +1,64 @@
+"""Counts the words and n-grams of many CountVectorizer settings in one pass over the headlines, split by label"""
+
+import re       # token patterns are regular expressions, like in CountVectorizer
+from collections import Counter     # one counter of n-grams per setting and label
+import numpy as np      # the counts of a Counter are turned into an array for the top-k selection
+from term_frequencies import frequencies        # shared top-k selection, also used for sparse CountVectorizer totals
+
+DEFAULT_PATTERN = r"(?u)\b\w\w+\b"      # CountVectorizer's default token_pattern, words of 2 or more characters
+CLOUD_WORDS = 200       # WordCloud draws at most max_words=200 words, so more frequencies are not needed
+
+# CountVectorizer settings of the word clouds as name -> (token pattern, ngram range), None is the default token pattern
+# session08_sarcasm_detection.py: words of 5 to 20 lowercase letters, and sequences of 4 words
+SESSION08_CLOUDS = {"520": ("[a-z]{5,20}", (1, 1)), "4": (None, (4, 4))}
+# extra_exam_tasks.py: words of 5 to 20 characters, words of 3 characters or fewer, and sequences of 3 to 6 words
+EXAM_CLOUDS = {"520": (r"\b\w{5,20}\b", (1, 1)), "13": (r"\b\w{1,3}\b", (1, 1)), "36": (None, (3, 6))}
+
+
+def vectorizer_config(config):
+    """Returns (token pattern, ngram range, lowercase) of a CountVectorizer or of a (token pattern, ngram range) tuple"""
+    if isinstance(config, tuple):
+        token_pattern, ngram_range = config
+        return token_pattern or DEFAULT_PATTERN, tuple(ngram_range), True
+    # the vectorizer is only read, it is not fitted, so its settings are used without tokenizing anything
+    return config.token_pattern or DEFAULT_PATTERN, tuple(config.ngram_range), config.lowercase
+
+
+def ngrams(tokens, ngram_range):
+    """Returns the n-grams of a list of tokens for every n in the range, joined with spaces like CountVectorizer does"""
+    low, high = ngram_range
+    grams = list(tokens) if low == 1 else []
+    for n in range(max(low, 2), min(high, len(tokens)) + 1):
+        # zip of the shifted token lists gives every sequence of n neighbouring tokens
+        grams.extend(map(" ".join, zip(*(tokens[i:] for i in range(n)))))
+    return grams
+
+
+def count_ngrams(sentences, labels, configs):
+    """Returns setting name -> label -> Counter of terms, for a dictionary of setting name -> vectorizer or tuple"""
+    configs = {name: vectorizer_config(config) for name, config in configs.items()}
+    # settings with the same token pattern share one tokenization of every sentence
+    patterns = {(pattern, lowercase): re.compile(pattern) for pattern, ngram_range, lowercase in configs.values()}
+    counts = {name: {} for name in configs}
+    for sentence, label in zip(sentences, labels):
+        lowered = sentence.lower()
+        tokens = {(pattern, lowercase): regex.findall(lowered if lowercase else sentence)
+                  for (pattern, lowercase), regex in patterns.items()}
+        for name, (pattern, ngram_range, lowercase) in configs.items():
+            counter = counts[name].get(label)
+            if counter is None:
+                counter = counts[name][label] = Counter()
+            counter.update(ngrams(tokens[(pattern, lowercase)], ngram_range))
+    return counts
+
+
+def top_counts(counts, k=None):
+    """Returns a term -> count dictionary of the k most frequent terms of a Counter, ties in alphabetical order"""
+    return frequencies(list(counts), np.fromiter(counts.values(), dtype=np.int64, count=len(counts)), k)
+
+
+def count_frequencies(sentences, labels, configs, k=None):
+    """Returns setting name -> label -> term -> count of the k most frequent terms, all settings from one pass"""
+    counts = count_ngrams(sentences, labels, configs)
+    return {name: {label: top_counts(counter, k) for label, counter in by_label.items()}
+            for name, by_label in counts.items()}
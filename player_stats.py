@@ -0,0 +1,64 @@
+# Class with running totals of a player's games, updated in O(1) for every finished game
+
+import heapq        # nlargest function used for the leaderboard
+
+
+class PlayerStats():
+    """Modeling the aggregate statistics of one player or of all players"""
+    FIELDS = ["games", "wins", "losses", "guess_sum", "time_sum", "streak", "best_streak"]      # order used when saving
+
+    def __init__(self, games=0, wins=0, losses=0, guess_sum=0, time_sum=0, streak=0, best_streak=0):
+        """Instantiates the counters, all zero for a new player"""
+        self.games = games
+        self.wins = wins
+        self.losses = losses
+        self.guess_sum = guess_sum      # sums instead of averages, so a new game is one addition
+        self.time_sum = time_sum
+        self.streak = streak        # wins in a row up to the last game
+        self.best_streak = best_streak
+
+    def add_game(self, num_guesses, time_used, result):
+        """Updates the counters with one finished game"""
+        self.games += 1
+        self.guess_sum += int(num_guesses)
+        self.time_sum += int(time_used)
+        if result == "W":
+            self.wins += 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+        else:
+            self.losses += 1
+            self.streak = 0     # a lost game ends the streak
+
+    def win_rate(self):
+        """Returns the share of games won, 0 if there are no games"""
+        return self.wins / self.games if self.games else 0.0
+
+    def average_guesses(self):
+        """Returns the average number of guesses used per game"""
+        return self.guess_sum / self.games if self.games else 0.0
+
+    def average_time(self):
+        """Returns the average length of a game in seconds"""
+        return self.time_sum / self.games if self.games else 0.0
+
+    def to_row(self):
+        """Returns the counters as a tuple in the order of FIELDS"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def summary(self):
+        """Returns the statistics as a dictionary that can be printed"""
+        return {"games": self.games,
+                "wins": self.wins,
+                "losses": self.losses,
+                "win_rate": round(self.win_rate(), 3),
+                "average_guesses": round(self.average_guesses(), 2),
+                "average_time": round(self.average_time(), 1),
+                "streak": self.streak,
+                "best_streak": self.best_streak,
+                }
+
+
+def leaderboard(stats_by_user, n=10):
+    """Returns the n best (username, PlayerStats) pairs, ranked by wins and then by win rate"""
+    return heapq.nlargest(n, stats_by_user.items(), key=lambda item: (item[1].wins, item[1].win_rate()))
@@ -0,0 +1,82 @@
+"""Renders every figure off-screen to PNG/SVG files, in parallel worker processes, and records how long each one took"""
+
+import matplotlib
+matplotlib.use("Agg")
+# the Agg backend draws into memory without a window, it is chosen before pyplot is imported
+# use() also wins over an MPLBACKEND set in the shell, and every worker process runs it when it imports this module
+
+import argparse     # command line options
+import json     # the render times are saved as json
+import os       # output folder and paths
+import time     # perf_counter measures each figure
+from concurrent.futures import ProcessPoolExecutor      # independent figures are rendered in separate processes
+
+DATASETS = {}       # dataset name -> DataFrame, loaded once per worker process
+DATA_FILES = {"dataprob2": "DataProb2.csv", "helmets": "helmets_data.csv"}       # raw input of each dataset
+
+
+def load_dataset(dataset):
+    """Returns the cleaned dataset, loading it the first time a worker needs it"""
+    if dataset not in DATASETS:
+        if dataset == "dataprob2":
+            from data_prob_2 import get_clean_dataset
+            DATASETS[dataset] = get_clean_dataset("DataProb2.csv", "exam_dataset.csv")
+        else:
+            from helmets_cleaning import load_clean_helmets
+            DATASETS[dataset] = load_clean_helmets("helmets_data.csv")
+    return DATASETS[dataset]
+
+
+def render_figure(name, output_folder, formats):
+    """Draws one figure and saves it in every format, returns the file paths and the render time in seconds"""
+    import matplotlib.pyplot as plt
+    import figures
+    dataset, function = figures.FIGURES[name]
+    df = load_dataset(dataset)
+    start = time.perf_counter()
+    fig = function(df)
+    paths = []
+    for file_format in formats:
+        path = os.path.join(output_folder, name + "." + file_format)
+        fig.savefig(path, bbox_inches="tight")
+        paths.append(path)
+    plt.close(fig)      # frees the figure, a worker renders many of them
+    return name, paths, time.perf_counter() - start
+
+
+def render_report(names=None, output_folder="report", formats=("png", "svg"), workers=None, budget=None):
+    """Renders the figures in a process pool, returns a dictionary of figure name -> render time"""
+    import figures
+    names = list(names or figures.FIGURES)
+    missing = [name for name in names if not os.path.exists(DATA_FILES[figures.FIGURES[name][0]])]
+    for name in missing:
+        print("{}: skipped, {} not found".format(name, DATA_FILES[figures.FIGURES[name][0]]))
+    names = [name for name in names if name not in missing]
+    if any(figures.FIGURES[name][0] == "dataprob2" for name in names):
+        from data_prob_2 import build_exam_dataset
+        build_exam_dataset()        # cleaned once here, so the workers do not all clean it at the same time
+    os.makedirs(output_folder, exist_ok=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(render_figure, names, [output_folder] * len(names), [list(formats)] * len(names)))
+    total = time.perf_counter() - start
+    times = {name: seconds for name, paths, seconds in results}
+    for name, seconds in times.items():
+        print("{}: {:.2f} s".format(name, seconds))
+    print("total: {:.2f} s".format(total))
+    with open(os.path.join(output_folder, "render_times.json"), "w") as times_file:
+        json.dump({"figures": times, "total": total}, times_file, indent=2)
+    if budget is not None and total > budget:
+        print("Warning: the report took {:.2f} s, the budget is {:.2f} s".format(total, budget))
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renders the figures of the datasets to image files without windows")
+    parser.add_argument("names", nargs="*", help="figures to render, all of them by default")
+    parser.add_argument("--output", default="report")
+    parser.add_argument("--formats", default="png,svg", help="comma separated, for example png,svg")
+    parser.add_argument("--workers", type=int, help="number of worker processes, default is one per core")
+    parser.add_argument("--budget", type=float, help="warn when rendering takes longer than this many seconds")
+    args = parser.parse_args()
+    render_report(args.names, args.output, args.formats.split(","), args.workers, args.budget)
@@ -0,0 +1,189 @@
+"""Regression fits, bootstrap confidence bands and KDE curves computed once with numpy and cached, so plots only draw them"""
+
+import hashlib      # the cache key is a hash of the data and the settings
+import os       # cache folder
+import pickle       # the computed statistics are saved as one pickle file per key
+from statistics import NormalDist       # z value of a confidence level for the analytic intervals
+
+import numpy as np      # vectorized fits, bootstrap and kernel density estimation
+import pandas as pd     # the statistics are computed per group of a DataFrame
+
+CACHE_FOLDER = "plot_stats_cache"
+MEMORY = {}     # cache key -> statistics, so the same process never loads a file twice
+BOOTSTRAP_ROWS = 5000       # above this many rows the intervals are computed analytically, a bootstrap costs n_boot x rows
+KDE_BINS = 4096     # above BOOTSTRAP_ROWS values a KDE is computed from this many histogram bins instead of every value
+
+
+def regression_fit(x, y, ci=95, n_boot=1000, grid_size=100, seed=0):
+    """Returns the least squares line on a grid and, if ci is not None, its bootstrap confidence band"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    grid = np.linspace(x.min(), x.max(), grid_size)
+    slope, intercept = np.polyfit(x, y, 1)
+    fit = {"grid": grid, "fit": intercept + slope * grid}
+    if ci is not None and len(x) > BOOTSTRAP_ROWS:
+        # with this many rows the bootstrap band is the normal band of least squares, one pass over the data is enough
+        z = NormalDist().inv_cdf(0.5 + ci / 200)
+        residuals = y - (intercept + slope * x)
+        spread = np.sqrt((residuals ** 2).sum() / (len(x) - 2))
+        x_var = ((x - x.mean()) ** 2).sum()
+        error = spread * np.sqrt(1 / len(x) + (grid - x.mean()) ** 2 / x_var) if x_var > 0 else np.zeros(grid_size)
+        fit["low"], fit["high"] = fit["fit"] - z * error, fit["fit"] + z * error
+    elif ci is not None and len(x) > 2:
+        # many bootstrap samples at once: one row of resampled indexes per sample instead of a loop of fits
+        # the samples are made in blocks of about 5 million values, so big datasets do not need a huge matrix
+        rng = np.random.default_rng(seed)
+        slopes = np.empty(n_boot)
+        intercepts = np.empty(n_boot)
+        per_block = max(1, 5000000 // len(x))
+        for start in range(0, n_boot, per_block):
+            rows = rng.integers(0, len(x), size=(min(per_block, n_boot - start), len(x)))
+            xb, yb = x[rows], y[rows]
+            x_mean, y_mean = xb.mean(axis=1), yb.mean(axis=1)
+            x_var = ((xb - x_mean[:, None]) ** 2).sum(axis=1)
+            covariance = ((xb - x_mean[:, None]) * (yb - y_mean[:, None])).sum(axis=1)
+            # a sample with only one distinct x has no slope, it is left flat
+            block_slopes = np.divide(covariance, x_var, out=np.zeros_like(covariance), where=x_var > 0)
+            slopes[start:start + len(rows)] = block_slopes
+            intercepts[start:start + len(rows)] = y_mean - block_slopes * x_mean
+        lines = intercepts[:, None] + slopes[:, None] * grid[None, :]
+        fit["low"], fit["high"] = np.percentile(lines, [(100 - ci) / 2, 100 - (100 - ci) / 2], axis=0)
+    return fit
+
+
+def kde_curve(values, grid_size=200, cut=3, block=4096):
+    """Returns a Gaussian kernel density estimate on a grid, with Scott's bandwidth like seaborn uses"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5) if len(values) > 1 else 1.0
+    bandwidth = bandwidth or 1.0        # all values the same
+    grid = np.linspace(values.min() - cut * bandwidth, values.max() + cut * bandwidth, grid_size)
+    points, weights = values, np.ones(len(values))
+    if len(values) > BOOTSTRAP_ROWS:
+        # many values are counted in KDE_BINS narrow bins first, each bin center then adds its count as weight
+        # the bins are far narrower than the bandwidth, so the curve stays the same and its cost does not grow with the rows
+        weights, edges = np.histogram(values, bins=KDE_BINS)
+        points = (edges[:-1] + edges[1:]) / 2
+    density = np.zeros(grid_size)
+    for start in range(0, len(points), block):      # blocks keep the grid x values matrix small for big datasets
+        distances = (grid[:, None] - points[None, start:start + block]) / bandwidth
+        density += np.exp(-0.5 * distances ** 2) @ weights[start:start + block]
+    density /= len(values) * bandwidth * np.sqrt(2 * np.pi)
+    return {"grid": grid, "density": density, "count": len(values)}
+
+
+def cache_key(kind, df, columns, settings):
+    """Returns a hash of the used columns and the settings"""
+    digest = hashlib.sha256(kind.encode())
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    digest.update(repr(sorted(settings.items())).encode())
+    return digest.hexdigest()[:32]
+
+
+def cached(key, compute):
+    """Returns the statistics of a key from memory, from the cache folder, or computes and saves them"""
+    if key in MEMORY:
+        return MEMORY[key]
+    path = os.path.join(CACHE_FOLDER, key + ".pkl")
+    if os.path.exists(path):
+        with open(path, "rb") as stats_file:
+            MEMORY[key] = pickle.load(stats_file)
+        return MEMORY[key]
+    MEMORY[key] = compute()
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    temporary = path + ".{}.tmp".format(os.getpid())       # one temporary file per process
+    with open(temporary, "wb") as stats_file:
+        pickle.dump(MEMORY[key], stats_file)
+    os.replace(temporary, path)     # other processes never see a half written file
+    return MEMORY[key]
+
+
+def group_keys(df, by):
+    """Returns (group key, rows) pairs, the key is a tuple of the values of the by columns"""
+    by = [column for column in by if column is not None]
+    if not by:
+        return [((), df)]
+    return [(key if isinstance(key, tuple) else (key,), rows) for key, rows in df.groupby(by, observed=True)]
+
+
+def regression_stats(df, x, y, by=(), ci=95, n_boot=1000):
+    """Returns group key -> regression fit for every group of the by columns"""
+    by = [column for column in by if column is not None]
+    settings = {"x": x, "y": y, "by": by, "ci": ci, "n_boot": n_boot}
+    return cached(cache_key("regression", df, [x, y] + by, settings),
+                  lambda: {key: regression_fit(rows[x], rows[y], ci, n_boot) for key, rows in group_keys(df, by)})
+
+
+def kde_stats(df, x, by=()):
+    """Returns group key -> KDE curve for every group of the by columns"""
+    by = [column for column in by if column is not None]
+    settings = {"x": x, "by": by}
+    return cached(cache_key("kde", df, [x] + by, settings),
+                  lambda: {key: kde_curve(rows[x]) for key, rows in group_keys(df, by)})
+
+
+def mean_interval(values, ci=95, n_boot=1000, seed=0):
+    """Returns the mean of the values and its confidence interval, like the error bars of sns.barplot"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    mean = values.mean()
+    if len(values) > BOOTSTRAP_ROWS:        # normal interval of the mean, the bootstrap would resample every row n_boot times
+        error = NormalDist().inv_cdf(0.5 + ci / 200) * values.std(ddof=1) / np.sqrt(len(values))
+        return {"mean": mean, "low": mean - error, "high": mean + error, "count": len(values)}
+    rows = np.random.default_rng(seed).integers(0, len(values), size=(n_boot, len(values)))
+    low, high = np.percentile(values[rows].mean(axis=1), [(100 - ci) / 2, 100 - (100 - ci) / 2])
+    return {"mean": mean, "low": low, "high": high, "count": len(values)}
+
+
+def mean_stats(df, x, y, ci=95, n_boot=1000):
+    """Returns x value -> mean of y and its confidence interval"""
+    settings = {"x": x, "y": y, "ci": ci, "n_boot": n_boot}
+    return cached(cache_key("mean", df, [x, y], settings),
+                  lambda: {key: mean_interval(rows[y], ci, n_boot) for (key,), rows in group_keys(df, [x])})
+
+
+def reservoir_sample(chunks, k, seed=0):
+    """Returns k random rows of a DataFrame given as an iterable of chunks, every row has the same chance"""
+    # reservoir sampling: only k rows are kept however many rows there are, so it also works on chunked files
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    seen = 0
+    for chunk in chunks:
+        if reservoir is None or len(reservoir) < k:     # the reservoir is filled first
+            take = k if reservoir is None else k - len(reservoir)
+            head = chunk.iloc[:take]
+            reservoir = head if reservoir is None else pd.concat([reservoir, head])
+            reservoir = reservoir.reset_index(drop=True)        # index = slot number 0 .. k-1
+            chunk = chunk.iloc[len(head):]
+            seen += len(head)
+        if len(chunk) == 0:
+            continue
+        # row number i replaces a random reservoir slot with probability k / (i + 1), all rows of the chunk at once
+        slots = rng.integers(0, seen + np.arange(1, len(chunk) + 1))
+        rows = np.flatnonzero(slots < k)
+        slots = slots[rows]
+        # when two rows pick the same slot the later one wins, like in the one-row-at-a-time algorithm
+        last_slots, last = np.unique(slots[::-1], return_index=True)
+        rows = rows[::-1][last]
+        # the reservoir index is the slot number, replaced slots are swapped with concat so the dtypes stay the same
+        replaced = np.zeros(len(reservoir), dtype=bool)
+        replaced[last_slots] = True
+        new_rows = chunk.iloc[rows].set_axis(last_slots, axis=0)
+        reservoir = pd.concat([reservoir[~replaced], new_rows]).sort_index()
+        seen += len(chunk)
+    return reservoir
+
+
+def box_stats(values, label=None, max_fliers=200, seed=0):
+    """Returns the statistics matplotlib's Axes.bxp() needs to draw one box, with at most max_fliers outliers"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])     # numpy uses a partial sort, no full sort of the data
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]        # whiskers like seaborn, 1.5 x IQR
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    if len(fliers) > max_fliers:        # drawing every outlier of millions of rows would cost more than the box
+        fliers = np.random.default_rng(seed).choice(fliers, max_fliers, replace=False)
+    return {"label": label, "q1": q1, "med": median, "q3": q3,
+            "whislo": inside.min() if len(inside) else q1, "whishi": inside.max() if len(inside) else q3,
+            "fliers": fliers}
@@ -0,0 +1,118 @@
+"""Cross-validates the sarcasm classifier over a grid of vectorizer and BernoulliNB settings, folds run in a process pool"""
+
+import argparse     # command line options
+import itertools        # product() makes the grid of settings
+import json     # the results can be saved as json
+import os       # paths in the temporary folder
+import tempfile     # the vectorized matrices are shared with the workers through files
+import time     # perf_counter measures vectorizing, fitting and predicting
+from concurrent.futures import ProcessPoolExecutor      # every fold of every setting is a separate task
+import numpy as np      # labels, fold indexes and mean accuracies
+from ngram_counter import DEFAULT_PATTERN       # CountVectorizer's default token_pattern
+from sarcasm_model import LABEL_NAMES       # 0/1 in the json file -> label names
+
+# the token patterns of session08_sarcasm_detection.py and extra_exam_tasks.py
+VECTORIZER_GRID = {"token_pattern": [DEFAULT_PATTERN, r"\b\w{5,20}\b", r"\b\w{1,3}\b"],
+                   "ngram_range": [(1, 1), (1, 2)],
+                   "min_df": [1, 2]}
+MODEL_GRID = {"alpha": [0.1, 0.5, 1.0],
+              "binarize": [0.0, 1.0]}       # 1.0 only counts words that are in a headline more than once
+MATRICES = {}       # matrix path -> (matrix, labels), loaded once per worker process
+
+
+def grid(options):
+    """Returns every combination of a dictionary of option -> list of values, as a list of dictionaries"""
+    return [dict(zip(options, values)) for values in itertools.product(*options.values())]
+
+
+def load_matrix(path):
+    """Returns the matrix and labels of one vectorizer setting, loading them the first time a worker needs them"""
+    if path not in MATRICES:
+        from scipy import sparse
+        MATRICES.clear()        # the tasks come setting by setting, so only the newest matrix is kept
+        MATRICES[path] = sparse.load_npz(path + ".npz"), np.load(path + ".labels.npy")
+    return MATRICES[path]
+
+
+def evaluate_fold(path, train, test, model_settings):
+    """Fits and scores BernoulliNB with every model setting on one fold, returns accuracy and timings of each"""
+    from sklearn.naive_bayes import BernoulliNB
+    X, y = load_matrix(path)
+    X_train, y_train, X_test, y_test = X[train], y[train], X[test], y[test]     # sliced once for all model settings
+    results = []
+    for settings in model_settings:
+        model = BernoulliNB(**settings)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fitted = time.perf_counter()
+        predicted = model.predict(X_test)
+        results.append({"accuracy": float((predicted == y_test).mean()),
+                        "fit_time": fitted - start, "predict_time": time.perf_counter() - fitted})
+    return results
+
+
+def cross_validate(input_path="Sarcasm.json", k=5, vectorizer_grid=VECTORIZER_GRID, model_grid=MODEL_GRID, workers=None):
+    """Runs k-fold cross-validation for every combination of the grids, returns one result per combination"""
+    import pandas as pd
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.model_selection import StratifiedKFold
+    data = pd.read_json(input_path, lines=True)
+    headlines = data["headline"].to_numpy()
+    labels = data["is_sarcastic"].map(LABEL_NAMES).to_numpy().astype(str)
+    # the same folds for every setting, random_state=100 like the train_test_split of session08
+    folds = list(StratifiedKFold(n_splits=k, shuffle=True, random_state=100).split(headlines, labels))
+    model_settings = grid(model_grid)
+    results = []
+    with tempfile.TemporaryDirectory() as folder, ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = []
+        for number, vectorizer_settings in enumerate(grid(vectorizer_grid)):
+            # the vocabulary is fitted on all headlines once per setting, and the matrix is shared by all its folds
+            # vectorizing does not look at the labels, so this only lets min_df see the test folds
+            start = time.perf_counter()
+            X = CountVectorizer(decode_error='replace', **vectorizer_settings).fit_transform(headlines)
+            vectorize_time = time.perf_counter() - start
+            path = os.path.join(folder, "setting{}".format(number))
+            sparse.save_npz(path + ".npz", X, compressed=False)
+            np.save(path + ".labels.npy", labels)
+            # the workers already run these folds while the next setting is vectorized
+            futures = [pool.submit(evaluate_fold, path, train, test, model_settings) for train, test in folds]
+            jobs.append((vectorizer_settings, X.shape[1], vectorize_time, futures))
+        for vectorizer_settings, n_features, vectorize_time, futures in jobs:
+            fold_results = [future.result() for future in futures]
+            for i, settings in enumerate(model_settings):
+                per_fold = [fold[i] for fold in fold_results]
+                accuracies = [result["accuracy"] for result in per_fold]
+                results.append(dict(vectorizer_settings, **settings,
+                                    features=n_features,
+                                    accuracy=float(np.mean(accuracies)),
+                                    accuracy_std=float(np.std(accuracies)),
+                                    vectorize_time=vectorize_time,
+                                    fit_time=float(np.mean([result["fit_time"] for result in per_fold])),
+                                    predict_time=float(np.mean([result["predict_time"] for result in per_fold]))))
+    return sorted(results, key=lambda result: -result["accuracy"])
+
+
+def print_results(results):
+    """Prints one line per combination, best accuracy first"""
+    print("{:<22} {:<7} {:>6} {:>5} {:>8} {:>9} {:>8} {:>8} {:>9}".format(
+        "token_pattern", "ngrams", "min_df", "alpha", "binarize", "features", "accuracy", "fit ms", "predict ms"))
+    for result in results:
+        print("{:<22} {:<7} {:>6} {:>5} {:>8} {:>9} {:>8.4f} {:>8.1f} {:>9.1f}".format(
+            result["token_pattern"], "{}-{}".format(*result["ngram_range"]), result["min_df"], result["alpha"],
+            result["binarize"], result["features"], result["accuracy"],
+            1000 * result["fit_time"], 1000 * result["predict_time"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validates the sarcasm classifier over a grid of settings")
+    parser.add_argument("input", nargs="?", default="Sarcasm.json")
+    parser.add_argument("-k", type=int, default=5, help="number of folds")
+    parser.add_argument("--workers", type=int, help="number of worker processes, default is one per core")
+    parser.add_argument("--output", help="save the results to this json file")
+    args = parser.parse_args()
+    results = cross_validate(args.input, args.k, workers=args.workers)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as results_file:
+            json.dump(results, results_file, indent=2)
@@ -0,0 +1,57 @@
+"""Trains the sarcasm classifier once and saves the vectorizer and the model, so predicting does not refit anything"""
+
+import argparse     # command line options
+import os       # the model file is replaced in one step
+import pickle       # the fitted vectorizer and model are saved as one pickle file
+
+MODEL_PATH = "sarcasm_model.pkl"
+LABEL_NAMES = {0: "Not Sarcasm", 1: "Sarcasm"}      # same labels as session08_sarcasm_detection.py
+
+
+def train_model(input_path="Sarcasm.json", streaming=False, chunksize=10000):
+    """Fits the vectorizer and BernoulliNB on every headline, returns (vectorizer, model)"""
+    if streaming:       # hashed features trained chunk by chunk, for a corpus that does not fit in memory
+        from sarcasm_streaming import train_streaming
+        return train_streaming(input_path, chunksize, test_every=0)
+    import pandas as pd
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.naive_bayes import BernoulliNB
+    data = pd.read_json(input_path, lines=True)
+    vectorizer = CountVectorizer()      # same settings as session08_sarcasm_detection.py
+    model = BernoulliNB()
+    model.fit(vectorizer.fit_transform(data["headline"]), data["is_sarcastic"].map(LABEL_NAMES).to_numpy())
+    return vectorizer, model
+
+
+def save_model(vectorizer, model, path=MODEL_PATH):
+    """Saves the fitted vectorizer and model to one file"""
+    temporary = path + ".{}.tmp".format(os.getpid())
+    with open(temporary, "wb") as model_file:
+        pickle.dump({"vectorizer": vectorizer, "model": model}, model_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)     # a running server never loads a half written file
+
+
+def load_model(path=MODEL_PATH):
+    """Returns the (vectorizer, model) saved by save_model()"""
+    with open(path, "rb") as model_file:
+        saved = pickle.load(model_file)
+    return saved["vectorizer"], saved["model"]
+
+
+def classifier(vectorizer, model):
+    """Returns a function that classifies a list of headlines and returns their labels"""
+    def classify(headlines):
+        # transform() returns a sparse matrix and predict() takes it as it is, .toarray() is not needed
+        return model.predict(vectorizer.transform(headlines)).tolist()
+    return classify
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trains the sarcasm classifier and saves it for the prediction server")
+    parser.add_argument("input", nargs="?", default="Sarcasm.json")
+    parser.add_argument("output", nargs="?", default=MODEL_PATH)
+    parser.add_argument("--streaming", action="store_true", help="train chunk by chunk with hashed features")
+    parser.add_argument("--chunksize", type=int, default=10000)
+    args = parser.parse_args()
+    save_model(*train_model(args.input, args.streaming, args.chunksize), path=args.output)
+    print("Saved the model to", args.output)
@@ -0,0 +1,115 @@
+"""Scores headlines with a fitted BernoulliNB using only numpy: log-probabilities of the words of a headline are summed"""
+
+import argparse     # command line options
+import re       # the token pattern of the vectorizer
+import time     # perf_counter for the startup and scoring times
+from collections import Counter     # how many times each word is in a headline
+import numpy as np      # the log-probability table
+from ngram_counter import ngrams        # n-grams joined like CountVectorizer does
+
+SCORER_PATH = "sarcasm_scorer.npz"
+
+
+def export_scorer(vectorizer, model, path=SCORER_PATH):
+    """Saves the vocabulary, tokenizer settings and log-probabilities of a fitted CountVectorizer and BernoulliNB"""
+    if (getattr(vectorizer, "vocabulary_", None) is None or vectorizer.analyzer != "word" or vectorizer.tokenizer
+            or vectorizer.preprocessor or vectorizer.stop_words or vectorizer.strip_accents):
+        raise ValueError("only a fitted CountVectorizer with a word analyzer and a token_pattern can be exported")
+    # BernoulliNB adds log P(word | class) for the words in a headline and log P(no word | class) for all others
+    # that is the same as a constant per class plus (log P(word) - log P(no word)) for each word in the headline
+    negative = np.log(1 - np.exp(model.feature_log_prob_))
+    # labels keep their own dtype, so a model trained on 0/1 still predicts 0/1
+    # only Python string objects are turned into a numpy string array, object arrays would need pickle to load
+    classes = np.asarray(model.classes_)
+    if classes.dtype == object:
+        classes = classes.astype(str)
+    np.savez(path,
+             weights=(model.feature_log_prob_ - negative).T,        # one row per word, one column per class
+             bias=model.class_log_prior_ + negative.sum(axis=1),
+             classes=classes,
+             terms=np.asarray(vectorizer.get_feature_names_out()).astype(str),     # term of every row, in order
+             token_pattern=np.array(vectorizer.token_pattern),
+             ngram_range=np.array(vectorizer.ngram_range),
+             lowercase=np.array(vectorizer.lowercase),
+             binarize=np.array(np.nan if model.binarize is None else model.binarize))
+
+
+class SarcasmScorer():
+    """Modeling a BernoulliNB classifier as a table of log-probabilities per word"""
+    def __init__(self, path=SCORER_PATH):
+        """Loads a table saved by export_scorer(), without importing scikit-learn"""
+        with np.load(path, allow_pickle=False) as table:
+            self.weights = table["weights"]
+            self.bias = table["bias"]
+            self.classes = table["classes"]
+            self.vocabulary = {term: i for i, term in enumerate(table["terms"].tolist())}
+            self.token_pattern = re.compile(str(table["token_pattern"]))
+            self.ngram_range = tuple(table["ngram_range"].tolist())
+            self.lowercase = bool(table["lowercase"])
+            binarize = float(table["binarize"])
+            self.binarize = None if np.isnan(binarize) else binarize
+
+    def token_ids(self, headline):
+        """Returns (vocabulary id, value) of every known word of a headline, value is 1 for a present word like in BernoulliNB"""
+        tokens = self.token_pattern.findall(headline.lower() if self.lowercase else headline)
+        counts = Counter(self.vocabulary.get(term) for term in ngrams(tokens, self.ngram_range))
+        counts.pop(None, None)      # words that are not in the vocabulary
+        if self.binarize is None:       # the model was trained on the counts themselves
+            return list(counts.items())
+        return [(i, 1) for i, count in counts.items() if count > self.binarize]
+
+    def joint_log_likelihood(self, headlines):
+        """Returns a headlines x classes array of log P(class) + log P(headline | class)"""
+        rows, ids, values = [], [], []
+        for row, headline in enumerate(headlines):
+            for i, value in self.token_ids(headline):
+                rows.append(row)
+                ids.append(i)
+                values.append(value)
+        rows = np.asarray(rows, dtype=np.intp)
+        scores = np.tile(self.bias, (len(headlines), 1))
+        words = self.weights[np.asarray(ids, dtype=np.intp)] * np.asarray(values, dtype=float)[:, None]
+        for column in range(len(self.classes)):     # all headlines at once, one bincount per class
+            scores[:, column] += np.bincount(rows, weights=words[:, column], minlength=len(headlines))
+        return scores
+
+    def predict(self, headlines):
+        """Returns the label of every headline, like BernoulliNB.predict()"""
+        return self.classes[self.joint_log_likelihood(headlines).argmax(axis=1)].tolist()
+
+
+def check_parity(vectorizer, model, headlines, path=SCORER_PATH):
+    """Returns how many headlines the numpy scorer labels differently from the scikit-learn model"""
+    scorer = SarcasmScorer(path)
+    expected = model.predict(vectorizer.transform(headlines))
+    mismatches = int((np.asarray(scorer.predict(headlines)) != expected).sum())
+    if hasattr(model, "predict_joint_log_proba"):       # scikit-learn 1.2 and newer
+        expected_scores = model.predict_joint_log_proba(vectorizer.transform(headlines))
+        if not np.allclose(scorer.joint_log_likelihood(headlines), expected_scores):
+            raise AssertionError("the log-probabilities of the numpy scorer differ from the model")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exports the saved sarcasm model to a numpy log-probability table")
+    parser.add_argument("--model", default="sarcasm_model.pkl", help="file saved by sarcasm_model.py")
+    parser.add_argument("--output", default=SCORER_PATH)
+    parser.add_argument("--data", default="Sarcasm.json", help="headlines for the parity check and the timing")
+    args = parser.parse_args()
+    import pandas as pd
+    from sarcasm_model import load_model
+    vectorizer, model = load_model(args.model)
+    export_scorer(vectorizer, model, args.output)
+    headlines = pd.read_json(args.data, lines=True)["headline"].tolist()
+    print("headlines labeled differently:", check_parity(vectorizer, model, headlines, args.output))
+    start = time.perf_counter()
+    scorer = SarcasmScorer(args.output)
+    print("startup: {:.1f} ms".format(1000 * (time.perf_counter() - start)))
+    sample = headlines[:10000]
+    start = time.perf_counter()
+    for headline in sample:
+        scorer.predict([headline])
+    print("one headline at a time: {:.1f} us per headline".format(1e6 * (time.perf_counter() - start) / len(sample)))
+    start = time.perf_counter()
+    scorer.predict(headlines)
+    print("all headlines at once: {:.1f} us per headline".format(1e6 * (time.perf_counter() - start) / len(headlines)))
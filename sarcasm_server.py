@@ -0,0 +1,192 @@
+# Classifies headlines as sarcasm or not from one long running process, over a local TCP socket or stdin/stdout
+#
+# json lines protocol, one request per line, the replies come back in the same order:
+#   {"id": 1, "headline": "some headline"}  ->  {"id": 1, "label": "Sarcasm"}
+#   "some headline"                         ->  {"id": null, "label": "Not Sarcasm"}
+# a line that is not a request is answered with {"error": "<message>"}
+#
+# the model is loaded once at startup, requests of every connection are put in one queue
+# and classified together in micro-batches, one transform() and predict() call per batch
+
+import argparse     # command line options for the port, the model file and the batch size
+import asyncio      # one event loop multiplexes every connection
+import json     # requests and replies are json lines
+import sys      # stdin and stdout for the stdio mode
+import time     # perf_counter for the benchmark
+
+from sarcasm_model import MODEL_PATH, load_model, classifier        # saved vectorizer and model
+
+
+class PredictionBatcher():
+    """Modeling a queue of headlines that are classified together in micro-batches"""
+    def __init__(self, classify, max_batch=256, max_wait=0.002):
+        """classify(headlines) returns the labels of a list of headlines, a batch waits at most max_wait seconds"""
+        self.classify = classify
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = None
+        self.task = None
+
+    def start(self):
+        """Starts the batching task, has to be called from the running event loop"""
+        self.queue = asyncio.Queue()
+        self.task = asyncio.ensure_future(self.run())
+
+    async def predict(self, headline):
+        """Returns the label of one headline, once its batch has been classified"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((headline, future))
+        return await future
+
+    def take_waiting(self, batch):
+        """Moves the requests that are already in the queue to the batch, up to max_batch"""
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+    async def run(self):
+        """Classifies the queued headlines batch by batch, forever"""
+        while True:
+            batch = [await self.queue.get()]
+            self.take_waiting(batch)
+            if len(batch) < self.max_batch and self.max_wait:
+                # a short wait lets more requests arrive, one call for many headlines is much cheaper than many calls
+                await asyncio.sleep(self.max_wait)
+                self.take_waiting(batch)
+            try:
+                labels = self.classify([headline for headline, future in batch])
+            except Exception as error:      # a broken batch answers its requests with the error, the server keeps running
+                for headline, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (headline, future), label in zip(batch, labels):
+                if not future.done():       # the client may have gone away
+                    future.set_result(label)
+
+    async def reply(self, line):
+        """Returns the json reply line of one request line"""
+        try:
+            request_id, headline = parse_request(line)
+        except ValueError as error:
+            return json.dumps({"error": str(error)})
+        try:
+            label = await self.predict(headline)
+        except Exception as error:
+            return json.dumps({"id": request_id, "error": str(error)})
+        return json.dumps({"id": request_id, "label": label})
+
+
+def parse_request(line):
+    """Returns (request id, headline) of a request line, raises ValueError if it is not a request"""
+    request = json.loads(line)      # json.JSONDecodeError is a ValueError
+    if isinstance(request, str):
+        return None, request
+    if not isinstance(request, dict) or not isinstance(request.get("headline"), str):
+        raise ValueError("a request needs a headline")
+    return request.get("id"), request["headline"]
+
+
+async def write_replies(replies, write, drain):
+    """Writes the replies in the order of the requests, a None in the queue ends it"""
+    while True:
+        task = await replies.get()
+        if task is None:
+            break
+        write((await task) + "\n")
+        if replies.empty():     # one drain for all the replies that were ready together
+            await drain()
+
+
+async def serve_lines(batcher, readline, write, drain):
+    """Answers request lines until readline() returns nothing, without waiting for a reply before reading on"""
+    # the replies queue is bounded, so a client that sends faster than the model classifies is slowed down
+    replies = asyncio.Queue(maxsize=4096)
+    writer_task = asyncio.ensure_future(write_replies(replies, write, drain))
+    while True:
+        line = await readline()
+        if not line:
+            break
+        if line.strip():
+            await replies.put(asyncio.ensure_future(batcher.reply(line.decode("utf-8", "replace"))))
+    await replies.put(None)
+    await writer_task
+
+
+async def serve_connection(batcher, reader, writer):
+    """Answers the requests of one connection until it is closed"""
+    await serve_lines(batcher, reader.readline, lambda text: writer.write(text.encode("utf-8")), writer.drain)
+    writer.close()
+
+
+async def serve_tcp(batcher, host="127.0.0.1", port=5006):
+    """Serves the json lines protocol on a local TCP socket"""
+    batcher.start()
+    server = await asyncio.start_server(lambda r, w: serve_connection(batcher, r, w), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def serve_stdio(batcher):
+    """Serves the json lines protocol on stdin and stdout"""
+    batcher.start()
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def flush():
+        sys.stdout.flush()
+    await serve_lines(batcher, reader.readline, sys.stdout.write, flush)
+
+
+async def benchmark_batcher(batcher, headlines, clients=64):
+    """Classifies the headlines through the batcher from many concurrent clients, prints throughput and latency"""
+    batcher.start()
+    latencies = []
+
+    async def client(share):
+        for headline in share:
+            start = time.perf_counter()
+            await batcher.predict(headline)
+            latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(headlines[i::clients]) for i in range(clients)))
+    total = time.perf_counter() - start
+    latencies.sort()
+    print("{} headlines: {:.0f} per second, p50 {:.2f} ms, p99 {:.2f} ms".format(
+        len(headlines), len(headlines) / total, 1000 * latencies[len(latencies) // 2],
+        1000 * latencies[int(len(latencies) * 0.99)]))
+
+
+def main(argv=None):
+    """Starts the prediction server"""
+    parser = argparse.ArgumentParser(description="Sarcasm prediction server, json lines over TCP or stdin/stdout")
+    parser.add_argument("--model", default=MODEL_PATH, help="file saved by sarcasm_model.py")
+    parser.add_argument("--scorer", help="table saved by sarcasm_scorer.py, scores with numpy instead of scikit-learn")
+    parser.add_argument("--port", type=int, default=5006)
+    parser.add_argument("--stdio", action="store_true", help="use stdin/stdout instead of a TCP socket")
+    parser.add_argument("--max-batch", type=int, default=256, help="most headlines classified in one call")
+    parser.add_argument("--max-wait", type=float, default=0.002, help="seconds a batch waits for more headlines")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="classify N headlines from Sarcasm.json and exit")
+    args = parser.parse_args(argv)
+    try:
+        if args.scorer:     # starts in milliseconds, scikit-learn is not imported
+            from sarcasm_scorer import SarcasmScorer
+            classify = SarcasmScorer(args.scorer).predict
+        else:
+            classify = classifier(*load_model(args.model))
+    except FileNotFoundError as error:
+        parser.error("{} not found, create it first with sarcasm_model.py or sarcasm_scorer.py".format(error.filename))
+    batcher = PredictionBatcher(classify, args.max_batch, args.max_wait)
+    if args.benchmark:
+        with open("Sarcasm.json") as json_file:
+            headlines = [json.loads(line)["headline"] for line, _ in zip(json_file, range(args.benchmark))]
+        headlines = (headlines * (args.benchmark // len(headlines) + 1))[:args.benchmark]
+        asyncio.run(benchmark_batcher(batcher, headlines))
+    elif args.stdio:
+        asyncio.run(serve_stdio(batcher))
+    else:
+        asyncio.run(serve_tcp(batcher, port=args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Trains the sarcasm classifier chunk by chunk with hashed features, so memory stays the same however big Sarcasm.json gets"""
+
+import argparse     # command line options
+import numpy as np      # boolean masks of the held out rows
+import pandas as pd     # pandas reads the json lines file in chunks
+from sklearn.feature_extraction.text import HashingVectorizer       # fixed width vectors without a vocabulary
+from sklearn.naive_bayes import BernoulliNB     # naive Bayes that can be trained one chunk at a time with partial_fit
+from sarcasm_model import LABEL_NAMES       # 0/1 in the json file -> label names
+
+N_FEATURES = 2 ** 16        # columns of the hashed matrix, more columns means fewer words sharing a column
+# BernoulliNB adds log P(no word | class) for every column a headline does not have, also for columns no headline ever had
+# with 2 ** 20 columns that sum swamped the real words, so the width stays close to the vocabulary of Sarcasm.json
+CLASSES = np.array(["Not Sarcasm", "Sarcasm"])      # partial_fit has to know every class from the first chunk
+
+
+def hashing_vectorizer(n_features=N_FEATURES, token_pattern=None, ngram_range=(1, 1)):
+    """Returns a HashingVectorizer that tokenizes like CountVectorizer and counts 0/1 presence for BernoulliNB"""
+    # a HashingVectorizer has no fit(), the column of a word is a hash of it, so nothing grows with the corpus
+    # alternate_sign=False and norm=None keep the values positive counts, BernoulliNB only asks if a value is over 0
+    options = {"token_pattern": token_pattern} if token_pattern else {}
+    return HashingVectorizer(n_features=n_features, ngram_range=ngram_range, alternate_sign=False, norm=None,
+                             binary=True, decode_error='replace', **options)
+
+
+def read_chunks(path="Sarcasm.json", chunksize=10000, test_every=5):
+    """Yields (headlines, labels, test) of every chunk, test marks every test_every-th row as held out"""
+    row = 0
+    for chunk in pd.read_json(path, lines=True, chunksize=chunksize):
+        headlines = chunk["headline"].to_numpy()
+        labels = chunk["is_sarcastic"].map(LABEL_NAMES).to_numpy()
+        # the same rows are held out in every pass over the file, without keeping a list of them
+        rows = np.arange(row, row + len(chunk))
+        test = rows % test_every == test_every - 1 if test_every else np.zeros(len(chunk), dtype=bool)
+        row += len(chunk)
+        yield headlines, labels, test
+
+
+def ignore_unseen_columns(model):
+    """Gives the columns that no training headline had the same probability in every class, like words not in a vocabulary"""
+    # a column with the same probability in every class adds the same number to every class, so it never changes a label
+    if not hasattr(model, "feature_count_"):        # no headline was trained on
+        return model
+    unseen = model.feature_count_.sum(axis=0) == 0
+    probability = model.alpha / (model.class_count_.sum() + 2 * model.alpha)
+    model.feature_log_prob_[:, unseen] = np.log(probability)
+    return model
+
+
+def train_streaming(path="Sarcasm.json", chunksize=10000, n_features=N_FEATURES, test_every=5, alpha=1.0):
+    """Trains BernoulliNB on the rows that are not held out, one chunk at a time, returns the vectorizer and model"""
+    vectorizer = hashing_vectorizer(n_features)
+    model = BernoulliNB(alpha=alpha)
+    for headlines, labels, test in read_chunks(path, chunksize, test_every):
+        if (~test).any():
+            model.partial_fit(vectorizer.transform(headlines[~test]), labels[~test], classes=CLASSES)
+    # partial_fit() sets the probabilities of every column again, so this is done once after the last chunk
+    return vectorizer, ignore_unseen_columns(model)
+
+
+def score_streaming(vectorizer, model, path="Sarcasm.json", chunksize=10000, test_every=5):
+    """Returns the accuracy of the model on the held out rows, read again chunk by chunk"""
+    correct = total = 0
+    for headlines, labels, test in read_chunks(path, chunksize, test_every):
+        if test.any():
+            correct += (model.predict(vectorizer.transform(headlines[test])) == labels[test]).sum()
+            total += test.sum()
+    return correct / total if total else float("nan")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trains the sarcasm classifier from Sarcasm.json chunk by chunk")
+    parser.add_argument("input", nargs="?", default="Sarcasm.json")
+    parser.add_argument("--chunksize", type=int, default=10000, help="headlines read and trained at a time")
+    parser.add_argument("--features", type=int, default=N_FEATURES, help="width of the hashed vectors")
+    parser.add_argument("--test-every", type=int, default=5, help="every n-th headline is held out for testing, 0 for none")
+    args = parser.parse_args()
+    vectorizer, model = train_streaming(args.input, args.chunksize, args.features, args.test_every)
+    if args.test_every:
+        print(score_streaming(vectorizer, model, args.input, args.chunksize, args.test_every))
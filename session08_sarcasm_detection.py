@@ -19,6 +19,7 @@ from sklearn.model_selection import train_test_split        # function that spli
 from sklearn.naive_bayes import BernoulliNB     # class that implements naive Bayes training and classification algos according to Bernoulli's distribution
 from wordcloud import WordCloud     # class from wordcloud package for generating wordclouds
 from matplotlib import pyplot as plt    # pyplot interface from matplotlib package imported
+from ngram_counter import count_frequencies, CLOUD_WORDS, SESSION08_CLOUDS       # word and n-gram frequencies of many vectorizer settings in one pass
 
 # load data
 # .read_json() is a function from the pandas package that reads json files as DataFrame objects
@@ -62,9 +63,11 @@ X = cv.fit_transform(x)
 # 4 sets, 2 for the X matrix and 2 for y ndarray, both given in the *arrays arbitrary positional argument
 # test_size= argument (between 0 and 1) determines how much of the data used for , the rest is used for training. Has to be given, because default=None
 # random_state= ensures reproducibility
+# sarcasm_evaluation.py runs k-fold cross-validation over a grid of vectorizer and model settings instead of one split
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.20, random_state=100)
 
 # Initialize the language model
+# sarcasm_streaming.py trains the same kind of model chunk by chunk with hashed features, for a corpus too big for memory
 # instantiates an object of the BernoulliNB class
 model = BernoulliNB()
 # train the model with the training set with the .fit() method
@@ -77,8 +80,9 @@ print(model.score(X_test, y_test))
 user = input("Enter a Text: ")
 # process input to feed it to the model
 # .transform() is a method for CV class that transforms text to a matrix
-# .toarray() is a method to convert matrices to ndarrays that can be fed to the model
-new_data = cv.transform([user]).toarray()
+# the sparse matrix can be fed to the model as it is, .toarray() would only make a dense copy of it
+# sarcasm_model.py saves a trained model and sarcasm_server.py answers many headlines without training again
+new_data = cv.transform([user])
 # .predict() method of BernoulliNB class predicts the result of an array when it is fed to a trained model
 output = model.predict(new_data)
 print(output)
@@ -87,66 +91,20 @@ print(output)
 
 ## Make word clouds of sarcastic and non sarcastic sentences using different vectorizer setting.
 
-# data is a DataFrame object
-# headline is a Series object in the data object
-# to_list() is a pandas method for Series objects that returns a list of values
-sarcastic_sentences = data[data['is_sarcastic'] == 'Sarcasm'].headline.to_list()
-not_sarcastic_sentences = data[data['is_sarcastic'] == 'Not Sarcasm'].headline.to_list()
-
-# 2 more CountVectorizer objects are instantiated
-# analyzer= differentiates between word or character n-grams, default is word
-# token_pattern= only used for analyzer="word" and it determines the range of word length (it could be useful to exclude short words)
+# 2 more vectorizer settings, SESSION08_CLOUDS in ngram_counter.py, as (token_pattern=, ngram_range=) of CountVectorizer
+# token_pattern= determines the range of word length (it could be useful to exclude short words)
 # token_pattern= could be expressed in regex, then it works better for 1-3 letter words
 # ngram_range= determines the combinations of n-grams that are tokenized
-# in this example, only 4-word sequences are tokenized
-# decode_error= determines what the program does if a character that is not in encoding is analyzed
-cv2 = CountVectorizer(analyzer='word', token_pattern="[a-z]{5,20}", decode_error='replace')
-cv3 = CountVectorizer(analyzer='word', ngram_range=(4, 4), decode_error='replace')
-
-# .fit_transform() method used again to convert list to matrix
-x2_s = cv2.fit_transform(sarcastic_sentences)
-# get_feature_names_out() method creates an array of all the different words (feature names) found in cv2 vocabulary that it go from previous method
-ngrams2_s = cv2.get_feature_names_out()
-# frequency of each word sorted in a ndarray
-ngrams2_s_freq = sum(x2_s.toarray())
-# empty dictionary for now
-vocab2_s = {}
-# counter
-i = 0
-# for loop iterates through every element of the array and stores it as a key
-# values are the frequency of the word in the frequency ndarray
-for k in ngrams2_s:
-    vocab2_s[k] = ngrams2_s_freq[i]
-    i += 1
-
-x2_ns = cv2.fit_transform(not_sarcastic_sentences)
-ngrams2_ns = cv2.get_feature_names_out()
-ngrams2_ns_freq = sum(x2_ns.toarray())
-vocab2_ns = {}
-i = 0
-for k in ngrams2_ns:
-    vocab2_ns[k] = ngrams2_ns_freq[i]
-    i += 1
-
-
-x3_s = cv3.fit_transform(sarcastic_sentences)
-ngrams3_s = cv3.get_feature_names_out()
-ngrams3_s_freq = sum(x3_s.toarray())
-vocab3_s = {}
-i = 0
-for k in ngrams3_s:
-    vocab3_s[k] = ngrams3_s_freq[i]
-    i += 1
-
-
-x3_ns = cv3.fit_transform(not_sarcastic_sentences)
-ngrams3_ns = cv3.get_feature_names_out()
-ngrams3_ns_freq = sum(x3_ns.toarray())
-vocab3_ns = {}
-i = 0
-for k in ngrams3_ns:
-    vocab3_ns[k] = ngrams3_ns_freq[i]
-    i += 1
+# "520" keeps words of 5 to 20 letters, "4" only 4-word sequences
+
+# count_frequencies() from ngram_counter.py reads every headline once and counts the words and n-grams
+# of both vectorizer settings, for sarcastic and not sarcastic headlines at the same time
+# only the CLOUD_WORDS most frequent words are kept, a wordcloud does not draw more than that anyway
+vocab = count_frequencies(data["headline"], data["is_sarcastic"], SESSION08_CLOUDS, CLOUD_WORDS)
+vocab2_s = vocab["520"]["Sarcasm"]
+vocab2_ns = vocab["520"]["Not Sarcasm"]
+vocab3_s = vocab["4"]["Sarcasm"]
+vocab3_ns = vocab["4"]["Not Sarcasm"]
 
 # creating wordclouds
 
@@ -0,0 +1,43 @@
+"""Word cloud frequencies from count totals: column totals of sparse CountVectorizer matrices and top-k selection"""
+
+import numpy as np      # column totals and top-k selection on numpy arrays
+
+
+def column_totals(matrix):
+    """Returns how many times every column (term) occurs in a sparse count matrix, as an int64 array"""
+    matrix = matrix.tocsr()     # CountVectorizer already returns csr, then this does not copy anything
+    # matrix.indices holds the column of every stored count, so one bincount adds up all columns
+    # a dense headlines x vocabulary array is never made, and a uint8 matrix can not overflow in the sum
+    return np.bincount(matrix.indices, weights=matrix.data, minlength=matrix.shape[1]).astype(np.int64)
+
+
+def top_k(totals, k=None, terms=None):
+    """Returns the column numbers of the k largest totals, largest first, ties in the order of terms or of the columns"""
+    totals = np.asarray(totals)
+    if k is not None and k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k is None or k >= len(totals):
+        candidates = np.arange(len(totals))
+    else:
+        # partial sort: the k-th largest total is found without sorting, then only the totals at least as big are sorted
+        # every tie of the k-th total is kept as a candidate, so the tie order does not depend on the partition
+        threshold = np.partition(totals, len(totals) - k)[len(totals) - k]
+        candidates = np.flatnonzero(totals >= threshold)
+    if terms is None:
+        order = np.argsort(-totals[candidates], kind="stable")
+    else:       # lexsort sorts by the last key first, so by total and then alphabetically
+        order = np.lexsort((np.asarray(terms)[candidates], -totals[candidates]))
+    return candidates[order][:k]
+
+
+def frequencies(terms, totals, k=None):
+    """Returns a term -> count dictionary of the k most frequent terms, ties in alphabetical order"""
+    terms = np.asarray(terms)
+    columns = top_k(totals, k, terms)
+    return dict(zip(terms[columns].tolist(), np.asarray(totals)[columns].tolist()))
+
+
+def fit_frequencies(vectorizer, sentences, k=None):
+    """Fits the vectorizer to the sentences and returns the term -> count dictionary of its k most frequent terms"""
+    matrix = vectorizer.fit_transform(sentences)
+    return frequencies(vectorizer.get_feature_names_out(), column_totals(matrix), k)
@@ -0,0 +1,39 @@
+"""Parity of the numpy scorer with the scikit-learn BernoulliNB it was exported from"""
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import BernoulliNB
+
+from sarcasm_scorer import SarcasmScorer, check_parity, export_scorer
+
+HEADLINES = ["area man thinks he is the best driver in the world",
+             "local mom wins award for most average casserole",
+             "senate passes budget bill after long debate",
+             "scientists discover new species of frog in brazil",
+             "nation's dogs demand to know who is a good boy",
+             "president signs trade agreement with canada"]
+LABELS = [1, 1, 0, 0, 1, 0]
+NEW_HEADLINES = ["area dog wins senate seat", "new frog species discovered", "", "completely unknown words here"]
+
+
+def fit(labels, **options):
+    """Returns a vectorizer and a model fitted on the inline headlines"""
+    vectorizer = CountVectorizer(**options)
+    model = BernoulliNB().fit(vectorizer.fit_transform(HEADLINES), labels)
+    return vectorizer, model
+
+
+def test_parity_with_integer_labels(tmp_path):
+    path = str(tmp_path / "scorer.npz")
+    vectorizer, model = fit(np.array(LABELS))
+    export_scorer(vectorizer, model, path)
+    assert check_parity(vectorizer, model, HEADLINES + NEW_HEADLINES, path) == 0
+    assert SarcasmScorer(path).predict(HEADLINES) == model.predict(vectorizer.transform(HEADLINES)).tolist()
+
+
+def test_parity_with_string_labels_and_ngrams(tmp_path):
+    path = str(tmp_path / "scorer.npz")
+    labels = np.array(["Sarcasm" if label else "Not Sarcasm" for label in LABELS], dtype=object)
+    vectorizer, model = fit(labels, ngram_range=(1, 2), token_pattern=r"\b\w{3,20}\b")
+    export_scorer(vectorizer, model, path)
+    assert check_parity(vectorizer, model, HEADLINES + NEW_HEADLINES, path) == 0
@@ -0,0 +1,41 @@
+"""Accuracy of the streaming sarcasm model compared with the CountVectorizer model on the same held out headlines"""
+
+import json
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.naive_bayes import BernoulliNB
+
+from sarcasm_streaming import N_FEATURES, read_chunks, score_streaming, train_streaming
+
+
+def write_headlines(path, n=3000, seed=0):
+    """Writes a Sarcasm.json like file, each label mostly has its own common words and both share the rest"""
+    rng = np.random.default_rng(seed)
+    shared = ["word{}".format(i) for i in range(3000)]
+    sarcastic = ["area", "man", "local", "nation", "thinks", "just", "report", "finally"]
+    serious = ["senate", "budget", "trump", "says", "study", "police", "court", "election"]
+    with open(path, "w") as json_file:
+        for label in rng.integers(0, 2, n):
+            own = sarcastic if label else serious
+            words = list(rng.choice(shared, 6)) + [rng.choice(own if rng.random() < 0.85 else sarcastic + serious)]
+            json_file.write(json.dumps({"headline": " ".join(words), "is_sarcastic": int(label)}) + "\n")
+
+
+def full_model_accuracy(path, test_every=5):
+    """Returns the held out accuracy of CountVectorizer and BernoulliNB fitted on all the other rows at once"""
+    headlines, labels, test = (np.concatenate(columns) for columns in zip(*read_chunks(path, 1000, test_every)))
+    vectorizer = CountVectorizer()
+    model = BernoulliNB().fit(vectorizer.fit_transform(headlines[~test]), labels[~test])
+    return (model.predict(vectorizer.transform(headlines[test])) == labels[test]).mean()
+
+
+def test_streaming_accuracy_matches_the_full_model(tmp_path):
+    path = str(tmp_path / "Sarcasm.json")
+    write_headlines(path)
+    full = full_model_accuracy(path)
+    assert full > 0.75
+    # 2 ** 20 columns are mostly never seen in training, they must not change the labels
+    for n_features in (N_FEATURES, 2 ** 20):
+        vectorizer, model = train_streaming(path, chunksize=1000, n_features=n_features)
+        assert score_streaming(vectorizer, model, path, chunksize=1000) >= full - 0.02
@@ -1,21 +1,104 @@
 # Class that collects and reads user data from a file
 import csv      # allows to read and write to csv files
+import json     # the running totals are saved next to the csv file
+import os       # size of the csv file and replacing the totals file
+from player_stats import PlayerStats, leaderboard       # running totals of the games of each player
+from userdata_loader import load_player_log     # typed loader that skips header rows of both file versions
+
+FIELDNAMES = ["username", "timestamp", "num_guesses", "time_used", "result"]      # keys of one game in the file
+STATS_PATH = "userdata.csv.stats.json"      # running totals of userdata.csv and how many bytes of it they include
 
 
 class UserData():
     """Modeling a dataset of player data"""
-    def __init__(self):
+    def __init__(self, store=None, writer=None):
         """Instantiates an object of userdata"""
+        # store is an optional UserDataStore from userdata_store.py, without it the csv file is used
+        # writer is an optional BufferedUserDataWriter from userdata_writer.py that appends games to the csv file in batches
+        self.store = store
+        self.writer = writer
+        self.stats = None       # username -> PlayerStats for the csv file, built on first use
+        self.global_stats = None
+        self.offset = 0     # bytes of the csv file that are included in the totals
+
+    def load_stats(self):
+        """Brings the running totals up to date with the csv file, only the games added since the last time are read"""
+        if self.writer is not None:
+            self.writer.flush()     # buffered games have to be in the file before it is read
+        if self.stats is None:
+            self.read_stats_file()      # totals saved by an earlier game, so a new process does not read every game again
+        size = os.path.getsize("userdata.csv")
+        if size < self.offset:      # the file was replaced by a shorter one, the saved totals do not belong to it
+            self.stats, self.global_stats, self.offset = {}, PlayerStats(), 0
+        if size == self.offset:
+            return
+        # load_player_log() knows both header versions, also when a header is repeated in the middle of the file
+        log = load_player_log("userdata.csv", self.offset)
+        for username, timestamp, num_guesses, time_used, result in log.games():
+            self.stats.setdefault(username, PlayerStats()).add_game(num_guesses, time_used, result)
+            self.global_stats.add_game(num_guesses, time_used, result)
+        if log.offset != self.offset:
+            self.offset = log.offset
+            self.write_stats_file()
+
+    def read_stats_file(self):
+        """Reads the totals saved next to the csv file, or starts from zero if there are none"""
+        self.stats, self.global_stats, self.offset = {}, PlayerStats(), 0
+        try:
+            with open(STATS_PATH, mode="r") as stats_file:
+                saved = json.load(stats_file)
+        except (OSError, ValueError):       # no file yet, or a broken one, then the csv file is read from the start
+            return
+        self.stats = {username: PlayerStats(*row) for username, row in saved["players"].items()}
+        self.global_stats = PlayerStats(*saved["all"])
+        self.offset = saved["offset"]
+
+    def write_stats_file(self):
+        """Saves the totals and the number of csv bytes they include next to the csv file"""
+        # the totals always match exactly the first offset bytes of the file, so it does not matter which process saves last
+        temporary = STATS_PATH + ".{}.tmp".format(os.getpid())
+        with open(temporary, mode="w") as stats_file:
+            json.dump({"offset": self.offset, "all": self.global_stats.to_row(),
+                       "players": {username: stats.to_row() for username, stats in self.stats.items()}}, stats_file)
+        os.replace(temporary, STATS_PATH)       # other processes never read a half written file
+
+    def all_stats(self):
+        """Returns the dictionary of username -> PlayerStats and the PlayerStats of all players"""
+        if self.store is not None:
+            return self.store.stats, self.store.global_stats
+        self.load_stats()       # only reads the games that were added since the last call
+        return self.stats, self.global_stats
+
+    def get_stats(self, username):
+        """Returns the PlayerStats of a player without reading any games"""
+        stats, global_stats = self.all_stats()
+        return stats.get(username, PlayerStats())
+
+    def get_leaderboard(self, n=10):
+        """Returns the n best (username, PlayerStats) pairs"""
+        stats, global_stats = self.all_stats()
+        return leaderboard(stats, n)
+
+    def print_stats(self, username):
+        """Prints the aggregate statistics of a player and of all players"""
+        stats, global_stats = self.all_stats()
+        print("Your statistics:")
+        for key, value in self.get_stats(username).summary().items():
+            print(str(key) + " : " + str(value))
+        print("\nAll players:")
+        for key, value in global_stats.summary().items():
+            print(str(key) + " : " + str(value))
 
     def read_data(self, username):      # parameter because it is used to find data in the file
         """Returns the player's statistics from the file when given a username"""
-        results = []        # empty list to later append with results
-        with open("userdata.csv", mode="r") as userdata_file:       # opens a specified csv file, mode r means read
-            user_data_reader = csv.DictReader(userdata_file)        # creates a DictReader object that can read dictionaries
-            for row in user_data_reader:        # row = dictionary in the userdata file
-                for key, value in row.items():      # iteration through the dictionaries
-                    if value == username:       # find all the games this player has played
-                        results.append(row)     # append list of results of the player with all data from those games
+        if self.store is not None:
+            results = self.store.user_games(username)       # indexed lookup, only this player's games are read
+        else:
+            if self.writer is not None:
+                self.writer.flush()     # so the player also sees the games that are still in the buffer
+            # the loader skips header rows of both versions, and games_of() only matches the username column
+            log = load_player_log("userdata.csv")
+            results = [dict(zip(FIELDNAMES, log.game(i))) for i in log.games_of(username)]
         print("Here are the stats for each of your games:")
         for games in results:       # iterates through the results list
             print("\n")
@@ -24,14 +107,19 @@ class UserData():
 
     def save_data(self, username, timestamp, num_guesses, time_used, result):       # parameters from the game that need to be stored in file
         """Saves the player's username, timestamp, number of guesses, time used and if they succeeded"""
-        with open("userdata.csv", mode="a", newline="") as userdata_file:       # opens the file, mode a means append, so previous data does not get overwritten
-            user_data_writer = csv.DictWriter(userdata_file, delimiter=",",
-                                              fieldnames=["username", "timestamp", "num_guesses", "time_used",
-                                                          "result"])        # creates object of DictWriter class that can create dictionaries in a file. Delimiter is what separates the values in the file. fieldnames = keys
-            user_data_writer.writerow({"username": username,
-                                       "timestamp": timestamp,
-                                       "num_guesses": num_guesses,
-                                       "time_used": time_used,
-                                       "result": result,
-                                       })       # creates key-value pairs for the game data and stores it in one row of the csv file with the .writerow() method
+        if self.store is not None:
+            self.store.add_game(username, timestamp, num_guesses, time_used, result)        # written together with the rest of the batch
+        elif self.writer is not None:
+            self.writer.add_game(username, timestamp, num_guesses, time_used, result)       # buffered, flushed by size, time or on exit
+        else:
+            with open("userdata.csv", mode="a", newline="") as userdata_file:       # opens the file, mode a means append, so previous data does not get overwritten
+                user_data_writer = csv.DictWriter(userdata_file, delimiter=",",
+                                                  fieldnames=FIELDNAMES)        # creates object of DictWriter class that can create dictionaries in a file. Delimiter is what separates the values in the file. fieldnames = keys
+                user_data_writer.writerow({"username": username,
+                                           "timestamp": timestamp,
+                                           "num_guesses": num_guesses,
+                                           "time_used": time_used,
+                                           "result": result,
+                                           })       # creates key-value pairs for the game data and stores it in one row of the csv file with the .writerow() method
+        # the csv totals are brought up to date from the end of the file when they are asked for, in load_stats()
         print("Your username and the statistics of your game have been recorded!")
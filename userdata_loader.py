@@ -0,0 +1,99 @@
+# Typed, columnar loader for userdata.csv that understands both header versions of the file
+
+import csv      # parses the rows
+from array import array     # compact typed columns that numpy can wrap without a copy (numpy.frombuffer)
+
+# both header versions of the file, mapped to the fieldnames used by UserData.save_data
+HEADERS = {("Username", "Time when the game was started", "Guesses used",
+            "Length of the game (seconds)", "Result of the game"): "v1",
+           ("username", "timestamp", "num_guesses", "time_used", "result"): "v2"}
+RESULT_CODES = {"L": 0, "W": 1}     # results are stored as one byte per game
+RESULT_LETTERS = {code: letter for letter, code in RESULT_CODES.items()}
+
+
+class PlayerLog():
+    """Modeling the games of userdata.csv as typed columns"""
+    def __init__(self):
+        """Creates empty columns"""
+        self.usernames = []     # code -> username
+        self.user_codes = {}        # username -> code
+        self.user = array("I")      # username code of each game
+        self.timestamp = []     # timestamps stay strings, they are only displayed
+        self.num_guesses = array("B")       # at most 8 guesses, one byte
+        self.time_used = array("I")     # seconds
+        self.result = array("B")        # 1 = won, 0 = lost
+        self.skipped_headers = 0        # header rows found in the file, including repeated ones
+        self.skipped_rows = 0       # rows that do not fit the schema
+        self.offset = 0     # byte offset in the file after the last row that was read
+
+    def __len__(self):
+        """Returns the number of games"""
+        return len(self.user)
+
+    def append(self, username, timestamp, num_guesses, time_used, result):
+        """Adds one game to the columns"""
+        # values are converted before anything is appended, so a bad row cannot leave the columns with different lengths
+        num_guesses, time_used, result = int(num_guesses), int(time_used), RESULT_CODES[result]
+        if not 0 <= num_guesses <= 255 or time_used < 0:        # would not fit the typed columns
+            raise ValueError("game values out of range")
+        code = self.user_codes.get(username)
+        if code is None:        # first game of this player
+            code = len(self.usernames)
+            self.user_codes[username] = code
+            self.usernames.append(username)
+        self.user.append(code)
+        self.timestamp.append(timestamp)
+        self.num_guesses.append(num_guesses)
+        self.time_used.append(time_used)
+        self.result.append(result)
+
+    def to_numpy(self):
+        """Returns the numeric columns as numpy arrays that share memory with the typed arrays"""
+        import numpy as np      # only needed for vectorized analytics, the loader itself works without numpy
+        return {"user": np.frombuffer(self.user, dtype=np.uint32),
+                "num_guesses": np.frombuffer(self.num_guesses, dtype=np.uint8),
+                "time_used": np.frombuffer(self.time_used, dtype=np.uint32),
+                "result": np.frombuffer(self.result, dtype=np.uint8),
+                }
+
+    def game(self, i):
+        """Returns (username, timestamp, num_guesses, time_used, result) of the game at an index"""
+        return (self.usernames[self.user[i]], self.timestamp[i], self.num_guesses[i], self.time_used[i],
+                RESULT_LETTERS[self.result[i]])
+
+    def games(self):
+        """Yields (username, timestamp, num_guesses, time_used, result) of every game, oldest first"""
+        for i in range(len(self.user)):
+            yield self.game(i)
+
+    def games_of(self, username):
+        """Returns the indexes of a player's games"""
+        code = self.user_codes.get(username)
+        return [i for i, user in enumerate(self.user) if user == code]
+
+
+def load_player_log(path="userdata.csv", offset=0):
+    """Reads userdata.csv from a byte offset into a PlayerLog, skipping header rows wherever they are in the file"""
+    log = PlayerLog()
+    log.offset = offset     # end of the last complete row that was read, the next read can start there
+    with open(path, mode="rb") as userdata_file:
+        userdata_file.seek(offset)
+
+        def complete_lines():
+            for line in userdata_file:
+                if not line.endswith(b"\n"):       # a row that another process is still writing
+                    break
+                log.offset += len(line)
+                yield line.decode("utf-8")
+        for row in csv.reader(complete_lines()):
+            if tuple(cell.strip() for cell in row) in HEADERS:      # a header of either version, also in the middle of the file
+                log.skipped_headers += 1
+                continue
+            if len(row) != 5:
+                log.skipped_rows += 1
+                continue
+            try:
+                log.append(*row)
+            except (KeyError, ValueError):      # unknown result or a number that is not a number
+                log.skipped_rows += 1
+    return log
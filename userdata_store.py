@@ -0,0 +1,111 @@
+# SQLite storage backend for player data, with an index on the username and batched writes
+
+import sqlite3      # database in one file that is part of the standard library
+
+from player_stats import PlayerStats        # running totals per player
+from userdata_class import FIELDNAMES       # column names used by UserData.save_data
+from userdata_loader import load_player_log     # reads the old userdata.csv file during migration
+
+MIGRATED_VERSION = 1        # PRAGMA user_version of a database that userdata.csv was copied into
+
+
+class UserDataStore():
+    """Modeling a database of played games, indexed by username"""
+    def __init__(self, path="userdata.db", batch_size=100):
+        """Opens or creates the database, games are written in batches of batch_size"""
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS games ("
+                                "id INTEGER PRIMARY KEY, username TEXT NOT NULL, timestamp TEXT, "
+                                "num_guesses INTEGER, time_used INTEGER, result TEXT)")
+        # the index stores (username, id) sorted, so one player's games are found without scanning the others
+        self.connection.execute("CREATE INDEX IF NOT EXISTS games_username ON games (username, id)")
+        # running totals, one row per player and one row with an empty username for all players together
+        self.connection.execute("CREATE TABLE IF NOT EXISTS player_stats (username TEXT PRIMARY KEY, "
+                                + ", ".join(field + " INTEGER" for field in PlayerStats.FIELDS) + ")")
+        self.connection.commit()
+        self.batch_size = batch_size
+        self.pending = []       # games that are not written to the database yet
+        # the totals are small (one row per player), so they are kept in memory and read in O(1)
+        self.stats = {row[0]: PlayerStats(*row[1:])
+                      for row in self.connection.execute("SELECT * FROM player_stats")}
+        self.global_stats = self.stats.pop("", PlayerStats())
+        self.changed = set()        # players whose totals have to be saved with the next batch
+        if not self.global_stats.games:
+            self.rebuild_stats()        # database from before the totals existed
+
+    def rebuild_stats(self):
+        """Recomputes the totals from the games table with one scan, oldest game first"""
+        self.stats = {}
+        self.global_stats = PlayerStats()
+        for username, num_guesses, time_used, result in self.connection.execute(
+                "SELECT username, num_guesses, time_used, result FROM games ORDER BY id"):
+            self.stats.setdefault(username, PlayerStats()).add_game(num_guesses, time_used, result)
+            self.global_stats.add_game(num_guesses, time_used, result)
+        if self.global_stats.games:
+            with self.connection:
+                self.connection.execute("DELETE FROM player_stats")
+                self.connection.executemany("INSERT INTO player_stats VALUES (?" + ", ?" * len(PlayerStats.FIELDS) + ")",
+                                            [(username,) + stats.to_row() for username, stats in self.stats.items()]
+                                            + [("",) + self.global_stats.to_row()])
+
+    def add_game(self, username, timestamp, num_guesses, time_used, result):
+        """Adds one game, the batch is written when it is full"""
+        self.buffer_game(username, timestamp, num_guesses, time_used, result)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def buffer_game(self, username, timestamp, num_guesses, time_used, result):
+        """Adds one game to the pending batch and to the totals, without writing anything"""
+        self.pending.append((username, timestamp, num_guesses, time_used, result))
+        self.stats.setdefault(username, PlayerStats()).add_game(num_guesses, time_used, result)
+        self.global_stats.add_game(num_guesses, time_used, result)
+        self.changed.add(username)
+
+    def flush(self, user_version=None):
+        """Writes every pending game in one transaction, and sets the database's user_version in it if given"""
+        if not self.pending and user_version is None:
+            return
+        with self.connection:       # commits at the end of the block, or rolls back if something fails
+            self.connection.executemany("INSERT INTO games (username, timestamp, num_guesses, time_used, result) "
+                                        "VALUES (?, ?, ?, ?, ?)", self.pending)
+            # the totals are saved in the same transaction, so they always match the games table
+            rows = [(username,) + self.stats[username].to_row() for username in self.changed]
+            rows.append(("",) + self.global_stats.to_row())
+            self.connection.executemany("INSERT OR REPLACE INTO player_stats VALUES (?"
+                                        + ", ?" * len(PlayerStats.FIELDS) + ")", rows)
+            if user_version is not None:
+                self.connection.execute("PRAGMA user_version = {:d}".format(user_version))
+        self.pending = []
+        self.changed = set()
+
+    def user_games(self, username):
+        """Returns a list of dictionaries with every game of a player, oldest first"""
+        self.flush()        # so the player also sees the games that are still in the batch
+        rows = self.connection.execute("SELECT username, timestamp, num_guesses, time_used, result "
+                                       "FROM games WHERE username = ? ORDER BY id", (username,))
+        return [dict(zip(FIELDNAMES, row)) for row in rows]
+
+    def migrate_from_csv(self, csv_path="userdata.csv"):
+        """Copies the games from a userdata.csv file into the database once, returns how many were copied"""
+        # user_version is 0 in a new database, the migration sets it in the same transaction as the copied games
+        # so running it again, or after a crash in the middle, never copies a game twice
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] >= MIGRATED_VERSION:
+            return 0
+        self.flush()        # games added before the migration are not part of its transaction
+        count = 0
+        for game in load_player_log(csv_path).games():     # header rows and broken rows are skipped by the loader
+            self.buffer_game(*game)
+            count += 1
+        self.flush(user_version=MIGRATED_VERSION)       # all games in one transaction, not in batches
+        return count
+
+    def close(self):
+        """Writes the pending games and closes the database"""
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
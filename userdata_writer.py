@@ -0,0 +1,136 @@
+# Buffered writer that appends finished games to userdata.csv in batches instead of one open/append/close per game
+
+import atexit       # flushes the buffer when the program exits
+import csv      # formats the rows the same way as UserData.save_data
+import io       # StringIO collects a batch of formatted rows before it is written
+import os       # low level append and fsync
+import tempfile     # temporary files for the benchmark
+import threading        # lock for the buffer and a timer for the time-based flush
+import time     # perf_counter used by the benchmark
+
+try:
+    import fcntl        # file locking on Linux and macOS
+except ImportError:
+    fcntl = None
+    import msvcrt       # file locking on Windows
+
+from userdata_class import FIELDNAMES       # column order of userdata.csv
+
+
+class FileLock():
+    """Modeling an exclusive lock that is shared by every process writing the same file"""
+    def __init__(self, path):
+        """Uses a separate lock file next to the data file, so readers of the data file are never blocked"""
+        self.path = path + ".lock"
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)     # waits until no other process holds the lock
+        else:
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        os.close(self.fd)
+
+
+class BufferedUserDataWriter():
+    """Modeling a write buffer for finished games"""
+    def __init__(self, path="userdata.csv", max_rows=100, flush_interval=1.0, fsync="batch"):
+        """Rows are written when max_rows are buffered or flush_interval seconds after the first buffered row"""
+        # fsync="batch" forces every written batch to disk, "never" leaves it to the operating system
+        if fsync not in ("batch", "never"):
+            raise ValueError("fsync must be 'batch' or 'never'")
+        self.path = path
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.rows = []
+        self.lock = threading.Lock()        # protects the buffer
+        self.flush_lock = threading.Lock()      # keeps batches from the timer and from add_game in order
+        self.timer = None
+        atexit.register(self.flush)     # flush-on-exit guarantee for normal exits and unhandled exceptions
+        # atexit does not run after os._exit(), for example in multiprocessing workers, so those should call close()
+
+    def add_game(self, username, timestamp, num_guesses, time_used, result):
+        """Buffers one game"""
+        with self.lock:
+            self.rows.append([username, timestamp, num_guesses, time_used, result])
+            full = len(self.rows) >= self.max_rows
+            if not full and self.timer is None and self.flush_interval is not None:
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True        # the timer must not keep the program alive, atexit flushes instead
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Appends every buffered game to the file in one write"""
+        with self.flush_lock:
+            with self.lock:
+                rows, self.rows = self.rows, []
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+            if rows:
+                self.write_rows(rows)
+
+    def write_rows(self, rows):
+        """Appends rows to the file while holding the file lock"""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\r\n").writerows(rows)        # same line ending as csv.DictWriter uses
+        data = buffer.getvalue().encode("utf-8")
+        with FileLock(self.path):       # another process cannot write between the check below and the append
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            try:
+                size = os.fstat(fd).st_size
+                if size:
+                    with open(self.path, "rb") as check:     # a file that does not end with a newline would glue two rows together
+                        check.seek(size - 1)
+                        if check.read(1) != b"\n":
+                            data = b"\r\n" + data
+                os.write(fd, data)      # one append of the whole batch, so a batch is never interleaved with another one
+                if self.fsync == "batch":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def close(self):
+        """Flushes the buffer, the writer should not be used afterwards"""
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def benchmark_writers(rows=2000):
+    """Compares one open/append/close per game with the buffered writer, in games per second"""
+    game = ["player", "2023-12-06 18:05", 8, 8, "L"]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "per_row.csv")
+        start = time.perf_counter()
+        for _ in range(rows):
+            with open(path, mode="a", newline="") as userdata_file:       # the same steps as UserData.save_data
+                csv.DictWriter(userdata_file, delimiter=",", fieldnames=FIELDNAMES).writerow(dict(zip(FIELDNAMES, game)))
+        per_row = rows / (time.perf_counter() - start)
+
+        results = {"per_row": per_row}
+        for fsync in ("never", "batch"):
+            writer = BufferedUserDataWriter(os.path.join(folder, fsync + ".csv"), max_rows=100, fsync=fsync)
+            start = time.perf_counter()
+            for _ in range(rows):
+                writer.add_game(*game)
+            writer.close()
+            results["buffered_fsync_" + fsync] = rows / (time.perf_counter() - start)
+    for name, games_per_second in results.items():
+        print("{}: {:.0f} games per second".format(name, games_per_second))
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_writers()
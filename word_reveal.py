@@ -0,0 +1,34 @@
+# Class that keeps the masked word of one game and only updates the slots of newly guessed letters
+
+
+class WordReveal():
+    """Modeling the revealed letters and blank spaces of a hangman word"""
+    def __init__(self, word):
+        """Precomputes where each letter of the word is"""
+        self.word = word.upper()
+        self.positions = {}     # letter -> list of indexes where the letter is in the word
+        for index, letter in enumerate(self.word):
+            self.positions.setdefault(letter, []).append(index)
+        self.slots = ["_"] * len(self.word)     # same output as Hangman.generate_word_string before any guess
+        self.hidden = len(self.positions)       # number of different letters still to be found
+        self.rendered = " ".join(self.slots)        # cached string, only rebuilt when a slot changes
+
+    def reveal(self, letter):
+        """Shows every slot of a guessed letter, returns how many slots were revealed"""
+        letter = letter.upper()
+        indexes = self.positions.get(letter)
+        if not indexes or self.slots[indexes[0]] != "_":        # not in the word or already revealed
+            return 0
+        for index in indexes:       # only the affected slots are touched, not the whole word
+            self.slots[index] = letter
+        self.hidden -= 1
+        self.rendered = " ".join(self.slots)
+        return len(indexes)
+
+    def is_solved(self):
+        """Returns True when every letter of the word has been revealed"""
+        return self.hidden == 0
+
+    def render(self):
+        """Returns the word with correctly guessed letters and blank spaces"""
+        return self.rendered        # no work when no letter changed since the last guess
@@ -0,0 +1,168 @@
+# Word store that indexes the SOWPODS dictionary once and picks random words without reading the file again
+
+import mmap     # memory-maps the dictionary file, so the operating system shares its pages between games
+import random       # randrange method used to pick a random word index
+import threading        # lock so that concurrent games build the selection buckets only once
+import time     # perf_counter used by the loader benchmark
+from array import array     # compact typed arrays, 4 bytes per number instead of a whole Python int object
+from bisect import bisect_right     # binary search in the cumulative bucket sizes
+from functools import lru_cache     # remembers the candidate plan of recently used constraints
+
+
+class WordStore():
+    """Modeling a memory-mapped word list with a line-offset index"""
+    def __init__(self, path="sowpods.txt"):
+        """Maps the file into memory and builds the line-offset index once"""
+        self.path = path
+        with open(path, "rb") as f:     # binary mode, because mmap works with bytes and not with decoded text
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # the map stays valid after the file object is closed
+        self.starts = self.build_index()
+        # selection buckets are only built when a constrained word is asked for the first time
+        self.lock = threading.Lock()
+        self.order = None       # word indexes sorted by (length, distinct letters)
+        self.cells = None       # (length, distinct letters) -> (start, end) slice of self.order
+        self.masks = None       # 26-bit mask of the letters in each word, bit 0 = A
+        self.plan = lru_cache(maxsize=256)(self.make_plan)
+
+    def build_index(self):
+        """Returns an array with the start offset of every non-empty line and the end of the file as a sentinel"""
+        starts = array("I")     # "I" = unsigned int, enough for files up to 4 GB
+        pos = 0
+        # one temporary split is much faster than calling .find() for every line, the pieces are freed afterwards
+        for line in self.data[:].split(b"\n"):
+            if line.strip():        # blank lines are skipped, so they are never picked as a word
+                starts.append(pos)
+            pos += len(line) + 1        # +1 for the newline removed by .split()
+        starts.append(len(self.data))     # sentinel, so word i always ends where word i+1 starts
+        return starts
+
+    def __len__(self):
+        """Returns the number of words in the store"""
+        return len(self.starts) - 1
+
+    def word_at(self, index):
+        """Returns the word with the given index"""
+        # the slice can also contain trailing blank lines, .strip() removes them together with the newline
+        return self.data[self.starts[index]:self.starts[index + 1]].strip().decode("ascii")
+
+    def random_word(self, rng=random):
+        """Returns a random word in O(1) without reading the file"""
+        return self.word_at(rng.randrange(len(self)))
+
+    def build_buckets(self):
+        """Builds the length, distinct-letter and letter-mask indexes over every word"""
+        with self.lock:
+            if self.order is not None:      # another game already built them
+                return
+            masks = array("I")
+            cells = {}
+            # words contain no whitespace, so one temporary .split() gives them in the same order as the index
+            for index, word in enumerate(self.data[:].upper().split()):
+                mask = 0
+                for code in set(word):      # iterating over bytes gives character codes
+                    if 65 <= code <= 90:        # only A-Z have a bit in the mask
+                        mask |= 1 << (code - 65)
+                masks.append(mask)
+                key = (min(len(word), 255), bin(mask).count("1"))
+                cells.setdefault(key, array("I")).append(index)
+            order = array("I")
+            ranges = {}
+            for key in sorted(cells):       # one contiguous slice of self.order per (length, distinct) bucket
+                ranges[key] = (len(order), len(order) + len(cells[key]))
+                order.extend(cells[key])
+            self.masks = masks
+            self.cells = ranges
+            self.order = order
+
+    def make_plan(self, min_length, max_length, min_distinct, max_distinct, required, excluded):
+        """Returns the cumulative sizes, slice starts and source array of the words matching the constraints"""
+        cumulative = []
+        starts = []
+        total = 0
+        for (length, distinct), (start, end) in self.cells.items():
+            if min_length <= length <= max_length and min_distinct <= distinct <= max_distinct:
+                total += end - start
+                cumulative.append(total)
+                starts.append(start)
+        if not required and not excluded:
+            return cumulative, starts, self.order       # no copy, the draw picks a bucket and then an offset in it
+        # letter constraints cannot be bucketed in advance, so the matching words are filtered once and cached
+        matching = array("I")
+        masks = self.masks
+        for i, start in enumerate(starts):
+            end = start + cumulative[i] - (cumulative[i - 1] if i else 0)
+            for index in self.order[start:end]:
+                mask = masks[index]
+                if mask & required == required and not mask & excluded:
+                    matching.append(index)
+        return [len(matching)], [0], matching
+
+    def select(self, min_length=1, max_length=255, min_distinct=1, max_distinct=26,
+               required_letters="", excluded_letters="", rng=random):
+        """Returns a random word that matches the length, distinct-letter and letter-set constraints"""
+        if self.order is None:
+            self.build_buckets()
+        plan = self.plan(min_length, max_length, min_distinct, max_distinct,
+                         letter_mask(required_letters), letter_mask(excluded_letters))
+        cumulative, starts, source = plan
+        if not cumulative or cumulative[-1] == 0:
+            raise ValueError("No word matches the given constraints")
+        r = rng.randrange(cumulative[-1])
+        bucket = bisect_right(cumulative, r)        # O(log number of buckets)
+        offset = r - (cumulative[bucket - 1] if bucket else 0)
+        return self.word_at(source[starts[bucket] + offset])
+
+    def close(self):
+        """Releases the memory map"""
+        self.data.close()
+
+
+def letter_mask(letters):
+    """Returns the 26-bit mask of the letters A-Z in a string"""
+    mask = 0
+    for letter in letters.upper():
+        if "A" <= letter <= "Z":
+            mask |= 1 << (ord(letter) - 65)
+    return mask
+
+
+_stores = {}        # one store per file path, shared by every game in the process
+
+
+def get_word_store(path="sowpods.txt"):
+    """Returns the shared WordStore for a path, building it on first use"""
+    store = _stores.get(path)
+    if store is None:
+        store = WordStore(path)
+        _stores[path] = store
+    return store
+
+
+def benchmark_loaders(path="sowpods.txt", rounds=200):
+    """Compares picking words with readlines() on every call against the indexed word store"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(path, "r") as f:      # the old path from Hangman.pick_random_word
+            words = f.readlines()
+        words[random.randint(0, len(words) - 1)].strip()
+    readlines_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = WordStore(path)     # building the index is paid once, so it is measured separately
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        store.random_word()
+    store_time = time.perf_counter() - start
+    store.close()
+
+    print("readlines per call: {:.3f} ms per word".format(readlines_time / rounds * 1000))
+    print("word store index build: {:.3f} ms (once)".format(build_time * 1000))
+    print("word store per call: {:.4f} ms per word".format(store_time / rounds * 1000))
+    return {"readlines": readlines_time / rounds, "build": build_time, "store": store_time / rounds}
+
+
+if __name__ == "__main__":
+    benchmark_loaders()
@@ -0,0 +1,100 @@
+"""Renders the word clouds of the sarcasm scripts to PNG files in parallel, unchanged clouds are copied from a cache"""
+
+import matplotlib
+matplotlib.use("Agg")
+# wordcloud uses matplotlib for its colormaps, the Agg backend never opens a window
+# use() also wins over an MPLBACKEND set in the shell, and every worker process runs it when it imports this module
+
+import argparse     # command line options
+import hashlib      # the cache key is a hash of the frequencies, the mask and the settings
+import json     # the frequencies are hashed as sorted json
+import os       # output and cache folders
+import shutil       # cached images are copied to the output folder
+import time     # perf_counter for the total time
+from concurrent.futures import ProcessPoolExecutor      # every cloud is laid out in its own process
+import numpy as np      # the circle mask
+
+CACHE_FOLDER = "wordcloud_cache"
+
+
+def circle_mask(size=300, radius=130):
+    """Returns the circle mask of extra_exam_tasks.py, 255 outside the circle where no word is drawn"""
+    x, y = np.ogrid[:size, :size]
+    mask = (x - size // 2) ** 2 + (y - size // 2) ** 2 > radius ** 2
+    return 255 * mask.astype(int)
+
+
+# the WordCloud settings of both scripts
+SESSION08_SETTINGS = {}
+EXAM_SETTINGS = {"background_color": "white", "min_font_size": 5, "contour_color": "yellow", "contour_width": 0.1}
+
+
+def cloud_key(frequencies, mask, settings):
+    """Returns a hash of everything that changes the image of a cloud"""
+    digest = hashlib.sha256(json.dumps(frequencies, sort_keys=True).encode())
+    if mask is not None:
+        mask = np.ascontiguousarray(mask)
+        digest.update(repr((mask.shape, mask.dtype.str)).encode())
+        digest.update(mask.tobytes())
+    digest.update(repr(sorted(settings.items())).encode())
+    return digest.hexdigest()[:32]
+
+
+def render_cloud(path, frequencies, mask, settings):
+    """Lays out one cloud and saves it as an image, returns the path"""
+    from wordcloud import WordCloud
+    cloud = WordCloud(mask=mask, **settings).generate_from_frequencies(frequencies)
+    temporary = path + ".{}.tmp.png".format(os.getpid())
+    cloud.to_file(temporary)        # writes the image with PIL, no matplotlib figure is made
+    os.replace(temporary, path)     # a cloud in the cache is never half written
+    return path
+
+
+def render_clouds(clouds, output_folder="clouds", workers=None):
+    """Saves every cloud of a dictionary of name -> (frequencies, mask, settings) as name.png, returns name -> path"""
+    os.makedirs(output_folder, exist_ok=True)
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    cached = {name: os.path.join(CACHE_FOLDER, cloud_key(*cloud) + ".png") for name, cloud in clouds.items()}
+    # clouds with the same key are laid out once, clouds already in the cache are not laid out at all
+    missing = {path: name for name, path in cached.items() if not os.path.exists(path)}
+    start = time.perf_counter()
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_cloud, missing, *zip(*(clouds[name] for name in missing.values()))))
+    paths = {}
+    for name, path in cached.items():
+        paths[name] = os.path.join(output_folder, name + ".png")
+        shutil.copyfile(path, paths[name])
+    print("{} clouds, {} laid out, {} from the cache, {:.2f} s".format(
+        len(clouds), len(missing), len(clouds) - len(missing), time.perf_counter() - start))
+    return paths
+
+
+def sarcasm_clouds(input_path="Sarcasm.json"):
+    """Returns the ten clouds of session08_sarcasm_detection.py and extra_exam_tasks.py, counted in one pass"""
+    import pandas as pd
+    from ngram_counter import count_frequencies, CLOUD_WORDS, SESSION08_CLOUDS, EXAM_CLOUDS
+    data = pd.read_json(input_path, lines=True)
+    labels = data["is_sarcastic"].map({0: "not_sarcasm", 1: "sarcasm"})
+    # the same token patterns and n-gram ranges as the two scripts, both read them from ngram_counter
+    configs = {"session08_" + name: config for name, config in SESSION08_CLOUDS.items()}
+    configs.update({"exam_" + name: config for name, config in EXAM_CLOUDS.items()})
+    vocab = count_frequencies(data["headline"], labels, configs, CLOUD_WORDS)
+    mask = circle_mask()
+    clouds = {}
+    for name, by_label in vocab.items():
+        for label, frequencies in by_label.items():
+            if name.startswith("exam"):
+                clouds[name + "_" + label] = (frequencies, mask, EXAM_SETTINGS)
+            else:
+                clouds[name + "_" + label] = (frequencies, None, SESSION08_SETTINGS)
+    return clouds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renders the word clouds of Sarcasm.json to image files without windows")
+    parser.add_argument("input", nargs="?", default="Sarcasm.json")
+    parser.add_argument("--output", default="clouds")
+    parser.add_argument("--workers", type=int, help="number of worker processes, default is one per core")
+    args = parser.parse_args()
+    render_clouds(sarcasm_clouds(args.input), args.output, args.workers)